@@ -1,159 +1,240 @@
-import concurrent.futures
-import sys
-from pathlib import Path
-from requests.exceptions import ConnectionError
-sys.path.append(str(Path(__file__).parent))
-
-from packages.constants import CONFIG_FILENAME, DESCRIPTION, LABELS, TOTAL_CORES
-from packages.datetimes import filter_by_datetime
-from packages.downloads import download_issues
-from packages.gantt import make_gantt_charts
-from packages.get_datetime import get_start_end_datetime
-from packages.indexes import calculate_indexes, verify_indexes
-from packages.json_handler import load_config, parse_config
-from packages.new_api import download_history, to_new_form
-from packages.occurrence import occurrence_curve
-from packages.old_api import download_old_history
-from packages.pie import pie
-from packages.results import make_result_folder
-from packages.timetable import timetable_calculation, timetable_summary
-from packages.windows import checkbuttons_window, result_window
-from packages.xlsx import write_xlsx
-
-def main():
-    """
-    Main function of the application.
-    Tool state changes (from GITLAB project) analysis.
-    """
-
-    print('Start analysis.')
-
-    # Ask user to select start and end datetime.
-    start_dt, end_dt = get_start_end_datetime()
-
-    print(f"\nStart date: {start_dt}")
-    print(f"End date: {end_dt}\n")
-    print('Downloading statuses and tools from GITLAB project...')
-
-    # Download config from packages/config.json.
-    config = load_config(CONFIG_FILENAME)
-
-    # Download project issues, LABELS and label colors.
-    try:
-        issues = download_issues()
-    except ConnectionError:
-        print('Request failed. Unable to establish connection with Gitlab.')
-        exit()
-    except Exception as ex:
-        print(ex)
-        exit()
-
-    # Ask user to select required issues.
-    title = 'Select tools: '
-    comment = DESCRIPTION +\
-              f'\nStart date: {start_dt}' +\
-              f'\nEnd date: {end_dt}' +\
-              '\nSelect tools for analysis: '
-    issues = checkbuttons_window(issues, title, comment)
-
-    if not issues:
-        print('No tools were selected. Exiting.')
-        exit()
-
-    # Create required result folders and files.
-    root_folder = Path(__file__).parent
-    result_folder, result_file, gantt_folder = make_result_folder(root_folder)
-    history_folder = root_folder / 'history'
-    history_folder.mkdir(exist_ok=True)
-
-    print('Downloading tool status change history from GITLAB project...')
-    history = {}
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=len(issues)//2 + 1) as executor:
-        # Download old_history via old Gitlab API.
-        futures = []
-        tools = []
-        for issue in issues.items():
-            futures.append(executor.submit(download_old_history, issue))
-        # Download new_history via new Gitlab API.
-        try:
-            for result in concurrent.futures.as_completed(futures):
-                old_history, issue = result.result()
-                tools.append(executor.submit(download_history, old_history, issue))
-
-            for tool in concurrent.futures.as_completed(tools):
-                history.update(tool.result())
-
-        except ConnectionError:
-            print('Request failed. Unable to establish connection with Gitlab.')
-            exit()
-        except Exception as ex:
-            print(ex)
-            exit()
-    
-    history = to_new_form(history)
-    # Remove history parts which are outside [start_dt, end_dt] bounds.
-    filter_by_datetime(history, start_dt, end_dt)
-    print('Calculating each status time for each tool...')
-
-    # Calculate timetable, i.e. duration of each issue label in history.
-    timetable = timetable_calculation(history)
-
-    # Calculate summary time for each issue and for each label.
-    summary = timetable_summary(timetable, issues, LABELS)
-    print('Calculating required production indexes...')
-
-    # Calculate all required production indexes:
-    # UPTIME, SERVICE_KPI, MTBF, EDU, MTTR, MTOL, MTBD, PII.
-    indexes, avg_indexes = calculate_indexes(summary,
-                                             history, LABELS)
-    # Load indexes specs from config.
-    specs = parse_config(config, 'specs')
-
-    # Verify each index in 'indexes' and 'avg_indexes' dicts.
-    verification = (verify_indexes(indexes, specs, True),
-                    verify_indexes(avg_indexes, specs, False))
-    print('Making charts...')
-    pie_charts = []
-    total_pie_charts = []
-    occurrence_charts = []
-    # Make required charts: pie, occurrence and Gantt charts.
-    with concurrent.futures.ProcessPoolExecutor(max_workers=( TOTAL_CORES//2 )) as executor:
-        charts = executor.map(pie,
-                              [summary[_id] for _id in issues.keys()],
-                              issues.values())
-        for chart in charts:
-            pie_charts.append(chart)
-
-        charts = executor.map(pie,
-                              [summary[_id] for _id in issues.keys()],
-                              issues.values(),
-                              [True]*len(issues))
-        for chart in charts:
-            total_pie_charts.append(chart)
-
-        charts = executor.map(occurrence_curve, [timetable[_id] for _id in issues.keys()], issues.values())
-        for chart in charts:
-            occurrence_charts.append(chart)
-
-        executor.map(make_gantt_charts, [history[_id] for _id in issues.keys()], issues.values(), [gantt_folder] * len(issues))
-    print('Writing results...')
-
-    # Write all required data to .xlsx file.
-    wb_data = (timetable, summary, issues, LABELS,\
-               indexes, avg_indexes, verification, specs,\
-               pie_charts, total_pie_charts, occurrence_charts,\
-               start_dt, end_dt)
-
-    write_xlsx(result_file, wb_data)
-    # Show result window to user.
-    title = 'Results'
-    comment = DESCRIPTION +\
-              f'\nStart date: {start_dt}' +\
-              f'\nEnd date: {end_dt}' +\
-              '\nDone.'
-    result_window(title, comment, link=result_folder)
-    print('\nAnalysis was successfully finished.')
-
-if __name__ == '__main__':
-    main()
+import argparse
+import sys
+from pathlib import Path
+from requests.exceptions import ConnectionError
+sys.path.append(str(Path(__file__).parent))
+sys.path.append(str(Path(__file__).parent / 'packages'))
+
+from packages.async_api import download_all_history
+from packages.charts import ChartJobTracker, ChartService
+from packages.gantt import write_gantt_bundle
+from packages.constants import CONFIG_FILENAME, DESCRIPTION, LABELS
+from packages.datetimes import WorkCalendar
+from packages.downloads import download_issues
+from packages.get_datetime import get_start_end_datetime
+from packages.indexes import calculate_indexes, verify_indexes
+from packages.json_handler import load_config, parse_config
+from packages.occurrence import occurrence_chart, occurrence_counts, write_occurrence_csv
+from packages.pipeline import download_stream, stream_analysis
+from packages.results import make_result_folder
+from packages.rolling import make_windows, rolling_report, write_rolling_csv
+from packages.timetable import format_timetable, timetable_rows
+from packages.transitions import TransitionStats
+from packages.uptime_cube import build_cubes
+from packages.windows import checkbuttons_window, result_window
+from packages.xlsx import write_xlsx
+# Imported by the same name as in 'packages' modules to share one session.
+from http_cache import configure_http_cache, http_cache_stats
+from scheduler import get_scheduler
+from session import close_session, configure_session, session_stats
+
+def main(engine='threads', window=None, step=None):
+    """
+    Main function of the application.
+    Tool state changes (from GITLAB project) analysis.
+
+    Args:
+        engine (str, default='threads'): download engine, 'threads' or 'async';
+        window (int, default=None): length of rolling report windows [days],
+                                    no rolling report if None;
+        step (int, default=None): step of rolling report windows [days],
+                                  equal to 'window' if None.
+    """
+
+    print('Start analysis.')
+
+    # Ask user to select start and end datetime.
+    start_dt, end_dt = get_start_end_datetime()
+
+    print(f"\nStart date: {start_dt}")
+    print(f"End date: {end_dt}\n")
+    print('Downloading statuses and tools from GITLAB project...')
+
+    # Download config from packages/config.json.
+    config = load_config(CONFIG_FILENAME)
+
+    # Set HTTP connection pool size, if it is defined in config.
+    if 'session' in config:
+        configure_session(**(parse_config(config, 'session') or {}))
+
+    # Set HTTP response cache options, if they are defined in config.
+    if 'http_cache' in config:
+        configure_http_cache(**(parse_config(config, 'http_cache') or {}))
+
+    # Download project issues, LABELS and label colors.
+    try:
+        issues = download_issues()
+    except ConnectionError:
+        print('Request failed. Unable to establish connection with Gitlab.')
+        exit()
+    except Exception as ex:
+        print(ex)
+        exit()
+
+    # Ask user to select required issues.
+    title = 'Select tools: '
+    comment = DESCRIPTION +\
+              f'\nStart date: {start_dt}' +\
+              f'\nEnd date: {end_dt}' +\
+              '\nSelect tools for analysis: '
+    issues = checkbuttons_window(issues, title, comment)
+
+    if not issues:
+        print('No tools were selected. Exiting.')
+        exit()
+
+    # Create required result folders and files.
+    root_folder = Path(__file__).parent
+    result_folder, result_file, gantt_folder = make_result_folder(root_folder)
+    history_folder = root_folder / 'history'
+    history_folder.mkdir(exist_ok=True)
+
+    # Count only working time, if working calendar is defined in config.
+    calendar = WorkCalendar(**(parse_config(config, 'calendar') or {})) if 'calendar' in config else None
+
+    # Save hourly label time cubes of the whole history, if they are enabled in config.
+    on_intervals = None
+    if 'uptime_cube' in config:
+        cube_options = parse_config(config, 'uptime_cube') or {}
+        on_intervals = lambda iid, intervals: build_cubes({iid: intervals}, issues, LABELS,
+                                                          **cube_options)
+
+    print('Downloading and analysing tool status change history from GITLAB project...')
+    history = {}
+    arrays = {}
+    summary = {iid: dict.fromkeys(LABELS.keys(), 0.) for iid in issues.keys()}
+
+    # Warm chart workers are used for the whole run, chart types
+    # may be skipped or deferred till the end in config.
+    # Charts of unchanged data are taken from the chart cache (options in config).
+    cache_options = (parse_config(config, 'chart_cache') or {}) if 'chart_cache' in config else {}
+    chart_service = ChartService(cache_options=cache_options)
+    chart_options = (parse_config(config, 'charts') or {}) if 'charts' in config else {}
+    charts = ChartJobTracker(chart_service, **chart_options)
+
+    # Each tool goes through pairing of label events, cutting by [start_dt, end_dt],
+    # time and summary calculation as soon as its download is complete.
+    try:
+        if engine == 'async':
+            # Download old and new history in a single event loop.
+            downloads = download_all_history(issues).items()
+        else:
+            downloads = download_stream(issues)
+
+        for iid, result in stream_analysis(downloads, LABELS, start_dt, end_dt,
+                                           calendar, on_intervals):
+            history[iid] = result['history']
+            arrays[iid] = result['arrays']
+            summary[iid] = result['summary']
+
+            # Charts of the tool are made while other tools are downloaded.
+            charts.submit(iid, summary[iid],
+                          occurrence_counts({iid: arrays[iid]}, {iid: None}, LABELS)[0].tolist(),
+                          history[iid], issues[iid], gantt_folder)
+
+    except ConnectionError:
+        print('Request failed. Unable to establish connection with Gitlab.')
+        chart_service.shutdown(cancel=True)
+        close_session()
+        exit()
+    except Exception as ex:
+        print(ex)
+        chart_service.shutdown(cancel=True)
+        close_session()
+        exit()
+
+    stats = session_stats()
+    print(f"HTTP requests: {stats['requests']}, "
+          f"connections opened: {stats['opened']}, reused: {stats['reused']}")
+    stats = get_scheduler().stats()
+    print(f"Retries: {stats['retries']}, throttled: {stats['throttled']}, "
+          f"failed: {stats['failed']}, concurrency limit: {stats['limit']}")
+    stats = http_cache_stats()
+    print(f"Pages not modified (from cache): {stats['hits']}, downloaded: {stats['misses']}")
+
+    # Timetable, i.e. duration of each issue label in history.
+    timetable = timetable_rows(arrays, LABELS)
+
+    # Occurrence curve data of all tools (tools x labels x bins) in one pass.
+    occurrence = occurrence_counts(arrays, issues, LABELS)
+    write_occurrence_csv(result_folder / 'occurrence.csv', occurrence, issues, LABELS)
+    print('Calculating required production indexes...')
+
+    # Count label changes and time before them for each tool, kept with the results.
+    transitions = TransitionStats.from_arrays(arrays, LABELS)
+    transitions.save(result_folder / 'transitions.npz')
+
+    # Calculate all required production indexes:
+    # UPTIME, SERVICE_KPI, MTBF, EDU, MTTR, MTOL, MTBD, PII.
+    indexes, avg_indexes = calculate_indexes(summary,
+                                             history, LABELS, transitions)
+    # Load indexes specs from config.
+    specs = parse_config(config, 'specs')
+
+    # Verify each index in 'indexes' and 'avg_indexes' dicts.
+    verification = (verify_indexes(indexes, specs, True),
+                    verify_indexes(avg_indexes, specs, False))
+
+    # Calculate the same for each window, if rolling report is required.
+    if window:
+        print('Calculating rolling report...')
+        windows = make_windows(start_dt, end_dt, window, step)
+        report = rolling_report(history, issues, LABELS, windows, specs, calendar)
+        write_rolling_csv(result_folder / 'rolling.csv', report, issues, LABELS)
+
+    print('Waiting for charts...')
+
+    # Tools which were not downloaded get charts of empty history.
+    for iid, tool_occurrence in zip(issues.keys(), occurrence.tolist()):
+        if iid not in history:
+            charts.submit(iid, summary[iid], tool_occurrence, [], issues[iid], gantt_folder)
+
+    charts.finish()
+    chart_service.shutdown()
+    close_session()
+    print(charts.report())
+
+    # Gantt charts of all tools are opened from one index page.
+    write_gantt_bundle(gantt_folder, issues.values())
+
+    # Occurrence curve of the whole fleet, i.e. sum of all tools.
+    fleet_chart = occurrence_chart(occurrence.sum(axis=0), 'All tools')
+    (result_folder / 'occurrence_all_tools.png').write_bytes(fleet_chart.getvalue())
+
+    # Skipped and failed charts are None.
+    pie_charts = [charts.chart(iid, 'pie') for iid in issues.keys()]
+    total_pie_charts = [charts.chart(iid, 'total_pie') for iid in issues.keys()]
+    occurrence_charts = [charts.chart(iid, 'occurrence') for iid in issues.keys()]
+    print('Writing results...')
+
+    # Write all required data to .xlsx file.
+    wb_data = (format_timetable(timetable), summary, issues, LABELS,\
+               indexes, avg_indexes, verification, specs,\
+               pie_charts, total_pie_charts, occurrence_charts,\
+               start_dt, end_dt)
+
+    write_xlsx(result_file, wb_data)
+    # Show result window to user.
+    title = 'Results'
+    comment = DESCRIPTION +\
+              f'\nStart date: {start_dt}' +\
+              f'\nEnd date: {end_dt}' +\
+              '\nDone.'
+    result_window(title, comment, link=result_folder)
+    print('\nAnalysis was successfully finished.')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Tool state changes analysis.')
+    parser.add_argument('--engine', choices=['threads', 'async'], default='threads',
+                        help='history download engine')
+    parser.add_argument('--window', type=int, default=None,
+                        help='length of rolling report windows [days]')
+    parser.add_argument('--step', type=int, default=None,
+                        help='step of rolling report windows [days], equal to --window by default')
+    args = parser.parse_args()
+
+    for name in ('window', 'step'):
+        if getattr(args, name) is not None and getattr(args, name) <= 0:
+            parser.error(f'--{name} must be a positive number of days')
+
+    main(engine=args.engine, window=args.window, step=args.step)
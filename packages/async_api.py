@@ -0,0 +1,366 @@
+import sys
+import time
+import asyncio
+from pathlib import Path
+from urllib.parse import urlsplit
+
+try:
+    import aiohttp
+
+except ImportError:
+    aiohttp = None
+
+sys.path.append(str(Path(__file__).parent))
+
+from constants import HEADERS, PROJ_URL
+from get_url import next_page_url, page_url
+from http_cache import cached_response, conditional_headers, load_entry, save_entry
+from scheduler import (MIN_CONCURRENCY, RETRY_STATUSES, MAX_RETRIES, get_scheduler,
+                       is_pushback, retry_delay, throttle_delay)
+from new_api import events_missed, events_start_page, merge_history
+from old_api import merge_old_history, notes_url
+from history_store import load_history
+
+# Max number of simultaneous requests for the whole run and for one host.
+MAX_CONCURRENCY = 32
+PER_HOST_CONCURRENCY = 16
+
+class AsyncAdaptiveLimit:
+    """
+    Asyncio counterpart of scheduler.AdaptiveLimit:
+    concurrency limit, which is halved when the server pushes back
+    and grows by one after 'window' successful requests.
+    """
+
+    def __init__(self,
+                 limit=MAX_CONCURRENCY, minimum=MIN_CONCURRENCY, window=20):
+
+        self.maximum = limit
+        self.minimum = minimum
+        self.limit = limit
+        self.window = window
+        self.active = 0
+        self.successes = 0
+        self.condition = asyncio.Condition()
+
+    async def __aenter__(self):
+
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+        return self
+
+    async def __aexit__(self, *args):
+
+        async with self.condition:
+            self.active -= 1
+            self.condition.notify()
+
+    def shrink(self):
+        """
+        Halves the limit (multiplicative decrease).
+
+        Args:
+            self: the instance of the class.
+        """
+
+        self.limit = max(self.minimum, self.limit // 2)
+        self.successes = 0
+
+    def grow(self):
+        """
+        Increases the limit by one every 'window' calls (additive increase).
+        Waiters see the new limit on the next release.
+
+        Args:
+            self: the instance of the class.
+        """
+
+        self.successes += 1
+
+        if self.successes >= self.window and self.limit < self.maximum:
+            self.limit += 1
+            self.successes = 0
+
+class AsyncFetcher:
+    """
+    Asyncio counterpart of the pooled session (session.py) and
+    request scheduler (scheduler.py).
+    Holds one aiohttp session, one adaptive global limit and
+    a semaphore per host, so the number of in-flight requests
+    stays constant regardless of the number of tools.
+    Failed requests are retried with the same policy as in scheduler.py,
+    retries are counted by the shared scheduler.
+    """
+
+    def __init__(self,
+                 max_concurrency=MAX_CONCURRENCY,
+                 per_host=PER_HOST_CONCURRENCY,
+                 max_retries=MAX_RETRIES):
+
+        if aiohttp is None:
+            raise ImportError('aiohttp is required for the async download engine.')
+
+        self.per_host = per_host
+        self.max_retries = max_retries
+        self.limit = AsyncAdaptiveLimit(max_concurrency)
+        self.hosts = {}
+        self.resume_at = 0.
+        connector = aiohttp.TCPConnector(limit=max_concurrency,
+                                         limit_per_host=per_host)
+        self.session = aiohttp.ClientSession(connector=connector,
+                                             headers=HEADERS,
+                                             auto_decompress=True)
+
+    def host_limit(self, url):
+        """
+        Returns semaphore of the url host.
+
+        Args:
+            self: the instance of the class;
+            url (str): requested url.
+        """
+
+        host = urlsplit(url).netloc
+
+        if host not in self.hosts:
+            self.hosts[host] = asyncio.Semaphore(self.per_host)
+
+        return self.hosts[host]
+
+    async def get(self, full_url):
+        """
+        Makes HTTP GET request within global and per-host limits,
+        retrying connection errors and RETRY_STATUSES.
+        Cached pages are requested conditionally (see http_cache.py).
+
+        Args:
+            self: the instance of the class;
+            full_url (str): webpage url with query;
+
+        Return:
+            body (list), headers (CIMultiDictProxy): JSON decoded content and headers.
+        """
+
+        scheduler = get_scheduler()
+        entry = load_entry(full_url)
+        headers = conditional_headers(entry)
+
+        for attempt in range(self.max_retries + 1):
+            delay = self.resume_at - time.monotonic()
+            if delay > 0.:
+                await asyncio.sleep(delay)
+
+            try:
+                async with self.limit, self.host_limit(full_url):
+                    scheduler.count('requests')
+
+                    async with self.session.get(full_url, headers=headers) as response:
+
+                        if response.status not in RETRY_STATUSES or attempt == self.max_retries:
+                            response.raise_for_status()
+
+                            if entry and response.status == 304:
+                                self.limit.grow()
+                                return cached_response(entry, response.headers)
+
+                            body = await response.json(content_type=None)
+                            save_entry(full_url, body, response.headers)
+
+                            if is_pushback(response.headers):
+                                scheduler.count('throttled')
+                                self.limit.shrink()
+                                self.resume_at = time.monotonic() + throttle_delay(response.headers)
+                            else:
+                                self.limit.grow()
+
+                            return body, response.headers
+
+                        status = response.status
+                        failed_headers = response.headers
+
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == self.max_retries:
+                    scheduler.count('failed')
+                    raise
+
+                scheduler.count('retries')
+                await asyncio.sleep(retry_delay(attempt))
+                continue
+
+            scheduler.count('retries')
+            if status == 429:
+                scheduler.count('throttled')
+            self.limit.shrink()
+
+            # Server defined delay holds all requests, backoff only this one.
+            delay = throttle_delay(failed_headers)
+            if delay > 0.:
+                self.resume_at = max(self.resume_at, time.monotonic() + delay)
+            else:
+                await asyncio.sleep(retry_delay(attempt))
+
+    async def close(self):
+        """
+        Closes aiohttp session and all its connections.
+        """
+
+        await self.session.close()
+
+async def async_get_url(fetcher, url, page):
+    """
+    Async counterpart of get_url.get_url.
+
+    Args:
+        fetcher (AsyncFetcher): fetcher to use;
+        url (str): webpage url;
+        page (int): page to request;
+
+    Return:
+        body (list): list with JSON decoded url content.
+    """
+
+    body, _ = await fetcher.get(page_url(url, page))
+
+    return body
+
+async def async_get_multipage_url(fetcher, url, starting_page=1):
+    """
+    Async counterpart of get_url.get_multipage_url.
+
+    Args:
+        fetcher (AsyncFetcher): fetcher to use;
+        url (str): webpage url;
+        starting_page (int): first page to request;
+
+    Return:
+        response (list): list with JSON decoded multipage url content.
+        num_of_pages (int): max page in the response
+    """
+
+    response, headers = await fetcher.get(page_url(url, starting_page))
+
+    if 'x-Total-Pages' in headers:
+        num_of_pages = int(headers['x-Total-Pages'])
+
+        pages = await asyncio.gather(
+            *[async_get_url(fetcher, url, page) for page in range(starting_page + 1, num_of_pages + 1)])
+
+        for page in pages:
+            response += page
+
+        return response, max(num_of_pages, 1)
+
+    num_of_pages = starting_page
+    next_url = next_page_url(url, headers)
+
+    while next_url:
+        page, headers = await fetcher.get(next_url)
+        response += page
+        num_of_pages += 1
+        next_url = next_page_url(url, headers)
+
+    return response, num_of_pages
+
+async def async_download_old_history(fetcher, issue, url=PROJ_URL):
+    """
+    Async counterpart of old_api.download_old_history.
+
+    Args:
+        fetcher (AsyncFetcher): fetcher to use;
+        issue (tuple): (issue_iid, issue_title);
+        url (string, default=PROJ_URL): project url;
+
+    Return:
+        history (dict), issue (tuple): see download_old_history.
+    """
+
+    issue_id = issue[0]
+    issue_name = issue[1]
+
+    cached_history = await asyncio.to_thread(load_history, issue_name, issue_id)
+
+    raw_issue_history, _ = await async_get_multipage_url(
+        fetcher, notes_url(url, issue_id, cached_history))
+
+    issue_history = await asyncio.to_thread(merge_old_history, issue,
+                                            raw_issue_history, cached_history)
+
+    return issue_history, issue
+
+async def async_download_history(fetcher, old_history, issue, url=PROJ_URL):
+    """
+    Async counterpart of new_api.download_history.
+
+    Args:
+        fetcher (AsyncFetcher): fetcher to use;
+        old_history (dict): history returned by download_old_history;
+        issue (tuple): (issue_iid, issue_title);
+        url (string, default=PROJ_URL): project url;
+
+    Return:
+        history (dict): see download_history.
+    """
+
+    issue_id = issue[0]
+    page_offset = events_start_page(old_history)
+
+    full_url = f'{url}/issues/{issue_id}/resource_label_events'
+    issue_history, _ = await async_get_multipage_url(fetcher, full_url,
+                                                     starting_page=page_offset)
+
+    # Earlier events were deleted and the cursor moved to previous pages.
+    while page_offset > 1 and events_missed(old_history, issue_history):
+        page_offset -= 1
+        issue_history, _ = await async_get_multipage_url(fetcher, full_url,
+                                                         starting_page=page_offset)
+
+    # Sorting and saving to disk are blocking, keep them off the event loop.
+    return await asyncio.to_thread(merge_history, old_history, issue,
+                                   issue_history, page_offset)
+
+async def _download_tool(fetcher, issue):
+    """
+    Downloads old and then new history of one issue.
+    """
+
+    old_history, issue = await async_download_old_history(fetcher, issue)
+
+    return await async_download_history(fetcher, old_history, issue)
+
+async def _download_all(issues, max_concurrency):
+    """
+    Downloads history of all issues, see download_all_history.
+    """
+
+    fetcher = AsyncFetcher(max_concurrency)
+    history = {}
+
+    try:
+        tools = [_download_tool(fetcher, issue) for issue in issues.items()]
+
+        for tool in asyncio.as_completed(tools):
+            history.update(await tool)
+
+    finally:
+        await fetcher.close()
+
+    return history
+
+def download_all_history(issues, max_concurrency=MAX_CONCURRENCY):
+    """
+    Downloads old and new history of all issues in a single event loop.
+
+    Args:
+        issues (dict): dict with project issues: (issue_iid, issue_title);
+        max_concurrency (int, default=MAX_CONCURRENCY): max simultaneous requests;
+
+    Return:
+        history (dict): merged download_history results of all issues.
+    """
+
+    return asyncio.run(_download_all(issues, max_concurrency))
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,88 @@
+import sys
+import json
+from io import BytesIO
+from pathlib import Path
+import matplotlib
+
+sys.path.append(str(Path(__file__).parent))
+
+from constants import LABELS, COLORS
+from disk_cache import CACHE_ROOT, DiskCache, hash_key
+
+CHART_CACHE_FOLDER = CACHE_ROOT / 'charts'
+CHART_CACHE_MAX_BYTES = 256 * 2**20
+
+# Version of the chart look, must be increased on every change
+# of pie or occurrence curve layout, so old images are not reused.
+STYLE_VERSION = 1
+
+_cache = DiskCache(CHART_CACHE_FOLDER, CHART_CACHE_MAX_BYTES, suffix='.png')
+_enabled = True
+
+def configure_chart_cache(enabled=True,
+                          max_bytes=CHART_CACHE_MAX_BYTES, folder=CHART_CACHE_FOLDER):
+    """
+    Sets chart cache options (in each chart worker, see charts.ChartService).
+
+    Args:
+        enabled (bool, default=True): whether cached charts are used;
+        max_bytes (int, default=CHART_CACHE_MAX_BYTES): cache size limit;
+        folder (Path, default=CHART_CACHE_FOLDER): cache folder.
+    """
+
+    global _cache, _enabled
+
+    _enabled = bool(enabled)
+    _cache = DiskCache(folder, int(max_bytes), suffix='.png')
+
+def chart_key(chart_type, title, data):
+    """
+    Makes key of the chart from everything the image depends on:
+    style version, matplotlib version, labels and colors,
+    chart type, title and input data.
+
+    Args:
+        chart_type (str): chart type, e.g. 'pie' or 'occurrence';
+        title (str): chart title;
+        data: json serializable input data of the chart;
+
+    Return:
+        key (str): chart key, see disk_cache.hash_key.
+    """
+
+    return hash_key(STYLE_VERSION, matplotlib.__version__,
+                    json.dumps([LABELS, COLORS], sort_keys=True),
+                    chart_type, title, json.dumps(data, sort_keys=True))
+
+def cached_chart(chart_type, title, data, render):
+    """
+    Returns image of the chart from the cache, the chart is rendered
+    and saved to the cache only if there is no image of the same data.
+
+    Args:
+        chart_type (str): chart type;
+        title (str): chart title;
+        data: json serializable input data of the chart (see chart_key);
+        render (callable): function without args, which returns BytesIO image;
+
+    Return:
+        image (io.BytesIO obj): image of the chart;
+        cached (bool): True if the image was taken from the cache.
+    """
+
+    if not _enabled:
+        return render(), False
+
+    key = chart_key(chart_type, title, data)
+    png = _cache.read(key)
+
+    if png is not None:
+        return BytesIO(png), True
+
+    image = render()
+    _cache.write(key, image.getvalue())
+
+    return image, False
+
+if __name__ == '__main__':
+    pass
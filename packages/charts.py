@@ -0,0 +1,304 @@
+import sys
+import time
+import concurrent.futures
+import multiprocessing
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from .chart_cache import cached_chart, configure_chart_cache
+from .constants import TOTAL_CORES
+from .gantt import make_gantt_charts
+from .occurrence import occurrence_chart
+from .pie import pie
+
+# Charts of one tool, in the order of render_tool_charts results.
+CHART_TYPES = ('pie', 'total_pie', 'occurrence', 'gantt')
+
+def _init_worker(cache_options):
+    """
+    Prepares chart worker: non-interactive matplotlib backend,
+    pyplot and plotly are imported once per worker, not per chart,
+    chart cache is configured (see chart_cache.configure_chart_cache).
+
+    Args:
+        cache_options (dict): chart cache options.
+    """
+
+    import matplotlib
+    matplotlib.use('Agg')
+
+    import matplotlib.pyplot
+    import plotly.graph_objects
+    import plotly.offline
+
+    configure_chart_cache(**cache_options)
+
+def render_tool_charts(summary, occurrence, history, issue_name, gantt_folder,
+                       chart_types=CHART_TYPES):
+    """
+    Renders charts of one tool in one task: pie, total pie,
+    occurrence and Gantt charts (or only 'chart_types' of them).
+    An error of one chart does not stop the others.
+    Images of the same data are taken from the chart cache.
+
+    Args:
+        summary (dict): summary time of the tool for each label;
+        occurrence (list): occurrence curve counts of the tool (labels, bins),
+                           see occurrence.occurrence_counts;
+        history (list): label changes history of the tool;
+        issue_name (str): tool name as in issue on Gitlab;
+        gantt_folder (Path object): folder of Gantt charts;
+        chart_types (tuple, default=CHART_TYPES): charts to render;
+
+    Return:
+        result (dict): 'charts' - BytesIO images of 'pie', 'total_pie' and
+                       'occurrence' ('gantt' is None, it is saved to gantt_folder),
+                       'seconds' - render time of each chart,
+                       'errors' - error message of each failed chart,
+                       'cached' - chart types taken from the cache.
+    """
+
+    render = {
+        'pie': lambda: cached_chart('pie', issue_name, summary,
+                                    lambda: pie(summary, issue_name)),
+        'total_pie': lambda: cached_chart('total_pie', issue_name, summary,
+                                          lambda: pie(summary, issue_name, True)),
+        'occurrence': lambda: cached_chart('occurrence', issue_name, occurrence,
+                                           lambda: occurrence_chart(occurrence, issue_name)),
+        'gantt': lambda: (make_gantt_charts(history, issue_name, gantt_folder), False)
+    }
+    result = {'charts': {}, 'seconds': {}, 'errors': {}, 'cached': []}
+
+    for chart_type in chart_types:
+        start = time.perf_counter()
+
+        try:
+            result['charts'][chart_type], cached = render[chart_type]()
+
+            if cached:
+                result['cached'].append(chart_type)
+
+        except Exception as ex:
+            result['errors'][chart_type] = f'{type(ex).__name__}: {ex}'
+
+        result['seconds'][chart_type] = time.perf_counter() - start
+
+    return result
+
+def _render_task(task):
+    """
+    Unpacks task of ChartService.render_all for render_tool_charts.
+    """
+
+    return render_tool_charts(*task)
+
+class ChartService:
+    """
+    Persistent process pool for chart rendering, which is used
+    for the whole run. Workers are started with 'spawn' (the pool may start
+    while download threads are running) and warmed up by _init_worker.
+    One task renders all charts of one tool, so the tool data is sent once.
+    'cache_options' are passed to chart_cache.configure_chart_cache in each worker.
+    """
+
+    def __init__(self, max_workers=TOTAL_CORES, cache_options=None):
+
+        self.max_workers = max(int(max_workers), 1)
+        self.executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(dict(cache_options or {}),))
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *args):
+
+        self.shutdown()
+
+    def submit(self, summary, occurrence, history, issue_name, gantt_folder,
+               chart_types=CHART_TYPES):
+        """
+        Submits charts of one tool, see render_tool_charts.
+
+        Args:
+            self: the instance of the class;
+            summary, occurrence, history, issue_name, gantt_folder,
+            chart_types: see render_tool_charts;
+
+        Return:
+            future (Future): future of render_tool_charts result.
+        """
+
+        return self.executor.submit(render_tool_charts, summary, occurrence, history,
+                                    issue_name, gantt_folder, chart_types)
+
+    def render_all(self, tasks):
+        """
+        Renders charts of many tools, which are known at once.
+        Tasks are sent in chunks, about four chunks per worker.
+
+        Args:
+            self: the instance of the class;
+            tasks (list): list of render_tool_charts args tuples
+                          (chart_types included);
+
+        Return:
+            charts (list): render_tool_charts results in tasks order.
+        """
+
+        chunksize = max(len(tasks) // (self.max_workers * 4), 1)
+
+        return list(self.executor.map(_render_task, tasks, chunksize=chunksize))
+
+    def shutdown(self, cancel=False):
+        """
+        Stops workers.
+
+        Args:
+            self: the instance of the class;
+            cancel (bool, default=False): cancel charts, which are not started.
+        """
+
+        self.executor.shutdown(cancel_futures=cancel)
+
+class ChartJobTracker:
+    """
+    Keeps track of chart tasks of all tools: collects images, render
+    time and errors of every chart, so no error is lost and the slowest
+    chart types are seen at the end of the run.
+    Chart types in 'skip' are not rendered, types in 'defer' are
+    rendered after all tools are submitted (see finish).
+    """
+
+    def __init__(self, service, skip=(), defer=()):
+
+        self.service = service
+        self.skip = set(skip)
+        self.defer = set(defer) - self.skip
+        self.now = tuple(chart_type for chart_type in CHART_TYPES
+                         if chart_type not in self.skip | self.defer)
+        self.later = tuple(chart_type for chart_type in CHART_TYPES if chart_type in self.defer)
+
+        self.futures = {}
+        self.deferred = {}
+        self.charts = {}
+        self.seconds = {chart_type: [] for chart_type in CHART_TYPES}
+        self.cached = dict.fromkeys(CHART_TYPES, 0)
+        self.errors = []
+
+    def submit(self, iid, summary, occurrence, history, issue_name, gantt_folder):
+        """
+        Submits charts of one tool, deferred charts are only remembered.
+
+        Args:
+            self: the instance of the class;
+            iid (int): issue id;
+            summary, occurrence, history, issue_name, gantt_folder: see render_tool_charts.
+        """
+
+        task = (summary, occurrence, history, issue_name, gantt_folder)
+        self.charts[iid] = {}
+
+        if self.now:
+            self.futures[iid] = (issue_name, self.service.submit(*task, self.now))
+        if self.later:
+            self.deferred[iid] = task
+
+    def finish(self):
+        """
+        Renders deferred charts and waits for all chart tasks.
+
+        Args:
+            self: the instance of the class.
+        """
+
+        results = []
+
+        for iid, (issue_name, future) in self.futures.items():
+            try:
+                results.append((iid, issue_name, future.result()))
+
+            except Exception as ex:
+                results.append((iid, issue_name, ex))
+
+        # Deferred charts of all tools are rendered together, in chunks.
+        if self.deferred:
+            tasks = list(self.deferred.items())
+
+            try:
+                rendered = self.service.render_all([task + (self.later,) for _, task in tasks])
+
+            except Exception as ex:
+                rendered = [ex] * len(tasks)
+
+            results += [(iid, task[3], result) for (iid, task), result in zip(tasks, rendered)]
+
+        self.futures = {}
+        self.deferred = {}
+
+        for iid, issue_name, result in results:
+            if isinstance(result, Exception):
+                self.errors.append((issue_name, 'all', f'{type(result).__name__}: {result}'))
+                continue
+
+            self.charts[iid].update(result['charts'])
+
+            for chart_type, seconds in result['seconds'].items():
+                self.seconds[chart_type].append(seconds)
+
+            for chart_type in result['cached']:
+                self.cached[chart_type] += 1
+
+            for chart_type, message in result['errors'].items():
+                self.errors.append((issue_name, chart_type, message))
+
+    def chart(self, iid, chart_type):
+        """
+        Returns image of the chart, None if it was skipped or failed.
+
+        Args:
+            self: the instance of the class;
+            iid (int): issue id;
+            chart_type (str): one of CHART_TYPES.
+        """
+
+        return self.charts.get(iid, {}).get(chart_type)
+
+    def report(self):
+        """
+        Makes text report: number of charts (and of cached ones), total, mean
+        and max render time of each chart type, slowest first,
+        and the list of failed charts.
+
+        Args:
+            self: the instance of the class;
+
+        Return:
+            report (str): report text.
+        """
+
+        lines = []
+        timings = sorted(((sum(seconds), chart_type, seconds)
+                          for chart_type, seconds in self.seconds.items() if seconds),
+                         reverse=True)
+
+        for total, chart_type, seconds in timings:
+            lines.append(f'{chart_type}: {len(seconds)} charts '
+                         f'({self.cached[chart_type]} from cache), total {total:.1f} s, '
+                         f'mean {total/len(seconds):.2f} s, max {max(seconds):.2f} s')
+
+        for chart_type in sorted(self.skip):
+            lines.append(f'{chart_type}: skipped')
+
+        lines.append(f'Failed charts: {len(self.errors)}')
+        for issue_name, chart_type, message in self.errors:
+            lines.append(f'  {issue_name}, {chart_type}: {message}')
+
+        return '\n'.join(lines)
+
+if __name__ == '__main__':
+    pass
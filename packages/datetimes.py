@@ -1,150 +1,147 @@
-
-import sys
-from datetime import datetime, timedelta, time
-from pathlib import Path
-
-sys.path.append(str(Path(__file__).parent))
-from constants import DT_FORMAT
-
-def preproc(dt):
-    """
-    Function makes dt (datetime object) preprocessing.
-    if dt.weekday==Monday and dt.time < 8:00    ---> dt.weekday==Monday and dt.time==8:00;
-    if dt.weekday==Saturday and dt.time >= 8:00 ---> dt.weekday==Monday and dt.time==8:00;
-    if dt.weekday==Sunday                       ---> dt.weekday==Monday and dt.time==8:00.
-
-    Args:
-        dt (datetime object): date and time before preprocessing;
-
-    Return:
-        dt (datetime object): date and time after preprocessing;
-    """
-
-    t = time(hour=8, minute=0)
-
-    if dt.weekday() == 6:
-        dt = datetime.combine(dt + timedelta(days=1), t) # weekday==6 <=> Sunday
-
-    elif dt.weekday() == 5 and dt.hour >= 8:
-        dt = datetime.combine(dt + timedelta(days=2), t) # weekday==5 <=> Saturday
-
-    elif dt.weekday() == 0 and dt.hour < 8:
-        dt = datetime.combine(dt, t) # weekday==0 <=> Monday
-
-    return dt
-
-def subtract_datetime(start_dt, end_dt):
-    """
-    Function calculates days, hours, minutes, seconds
-    between two datetime objects: start_dt and end_dt (including Weekends)
-
-    Args:
-        start_dt (datetime object): start datetime;
-        end_dt (datetime object): end datetime;
-
-    Return:
-        days, hours, minutes, seconds (tuple): number of days, hours, minutes, seconds
-                                               between start_dt and end_dt;
-
-    """
-
-    # Total seconds between start_dt and end_dt.
-    seconds = (end_dt - start_dt).total_seconds()
-    minutes = seconds/60.0
-    hours = minutes/60.0
-    days = hours/24.0
-
-    return days, hours, minutes, seconds
-
-def _subtract_datetime(start_dt, end_dt):
-    """
-    Function calculates days, hours, minutes, seconds
-    between two datetime objects: start_dt and end_dt
-    Weekends are ignored.
-
-    Args:
-        start_dt (datetime object): start datetime;
-        end_dt (datetime object): end datetime;
-
-    Return:
-        days, hours, minutes, seconds (tuple): number of days, hours, minutes, seconds
-                                               between start_dt and end_dt;
-
-    """
-
-    start_dt = preproc(start_dt)
-    end_dt = preproc(end_dt)
-
-    # List with datetime objs which correspond to each day between start_dt and end_dt.
-    days = [start_dt + timedelta(x + 1) for x in range((end_dt - start_dt).days)]
-
-    days_off = []
-
-    # Calculate weekend days between start_dt and end_dt.
-    for day in days:
-
-        if day.date() == end_dt.date():
-            if day.weekday() == 5 and day.hour >= 8: # weekday==5 <=> Saturday
-                days_off.append(day)
-
-        else:
-            if day.weekday() >= 5:
-                days_off.append(day)
-
-    days_off.sort()
-    seconds_off = len(days_off)*24.*60.*60.
-
-    # Total seconds except weekends.
-    seconds = (end_dt - start_dt).total_seconds() - seconds_off
-    minutes = seconds/60.0
-    hours = minutes/60.0
-    days = hours/24.0
-
-    return days, hours, minutes, seconds
-
-def filter_by_datetime(history,
-                       start_dt, end_dt):
-    """
-    Filters history by datetime. Function leaves only data
-    which satisfy one of the conditions:
-    1. data were 'added' in [start_dt, end_dt] bounds;
-    2. data were 'added' before start_dt and 'removed' after start_dt;
-
-    Args:
-        history (dict): input data to be filtered;
-        start_dt (datetime obj): start datetime, selected by user;
-        end_dt (datetime obj): end datetime, selected by user;
-
-    Return:
-        filtered_history (dict): filtered data.
-    """
-
-    try:
-        for iid, data in history.items():
-            to_delete = []
-            for i, entry in enumerate(data):
-
-                dt_added = datetime.strptime(entry['added'], DT_FORMAT)
-                dt_removed = datetime.strptime(entry['removed'], DT_FORMAT)
-
-                if dt_added >= end_dt:
-                    to_delete.append(i)
-
-                elif dt_removed <= start_dt:
-                    to_delete.append(i)
-
-                else:
-                    if dt_removed > end_dt:
-                        data[i]['removed'] = end_dt.strftime(DT_FORMAT)
-                    if dt_added < start_dt:
-                        data[i]['added'] = start_dt.strftime(DT_FORMAT)
-
-            for i in to_delete[::-1]:
-                del history[iid][i]
-
-    except KeyError:
-        print("Error during history filtering by datetime.")
-        exit()
-
-if __name__ == '__main__':
-    pass
+
+import sys
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent))
+from constants import DT_FORMAT
+
+# Timestamps are kept as integer microseconds since EPOCH (UTC, naive).
+EPOCH = datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+US_PER_SECOND = 1000000
+US_PER_DAY = 86400 * US_PER_SECOND
+
+@lru_cache(maxsize=65536)
+def _epoch_day(year, month, day):
+    """
+    Returns number of days from EPOCH to the date.
+    """
+
+    return date(year, month, day).toordinal() - EPOCH_ORDINAL
+
+def parse_dt(date_str):
+    """
+    Fast parser of GitLab dates: 'YYYY-MM-DDTHH:MM:SS[.ffffff]Z'.
+    Other formats are parsed by datetime.strptime with DT_FORMAT.
+
+    Args:
+        date_str (str): date string;
+
+    Return:
+        ts (int): microseconds since EPOCH.
+    """
+
+    try:
+        if date_str[10] != 'T' or date_str[-1] != 'Z':
+            raise ValueError(date_str)
+
+        days = _epoch_day(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]))
+        seconds = int(date_str[11:13])*3600 + int(date_str[14:16])*60 + int(date_str[17:19])
+
+        fraction = date_str[20:-1]
+        micro = int(fraction[:6].ljust(6, '0')) if fraction else 0
+
+    except (ValueError, IndexError):
+        return to_epoch(datetime.strptime(date_str, DT_FORMAT))
+
+    return days*US_PER_DAY + seconds*US_PER_SECOND + micro
+
+def format_dt(ts):
+    """
+    Formats timestamp as GitLab date string with milliseconds,
+    e.g. '2018-03-27T07:09:46.768Z'. Used only for output.
+
+    Args:
+        ts (int): microseconds since EPOCH;
+    """
+
+    dt = from_epoch(ts)
+
+    return f'{dt:%Y-%m-%dT%H:%M:%S}.{dt.microsecond // 1000:03d}Z'
+
+def to_epoch(dt):
+    """
+    Converts datetime object into microseconds since EPOCH.
+
+    Args:
+        dt (datetime object): naive UTC datetime;
+    """
+
+    return (dt - EPOCH) // timedelta(microseconds=1)
+
+def from_epoch(ts):
+    """
+    Converts microseconds since EPOCH into datetime object.
+
+    Args:
+        ts (int): microseconds since EPOCH;
+    """
+
+    return EPOCH + timedelta(microseconds=int(ts))
+
+class WorkCalendar:
+    """
+    Working calendar: each working day has one shift, which starts at
+    'shift_start' (wall clock) and lasts 'shift_hours' (may end next day).
+    Working days are set by 'weekmask' (Monday first) without 'holidays'.
+    Working time up to any timestamp is found with np.busday_count
+    (week arithmetic and a sorted holiday array), so any number of
+    intervals is calculated at once, whatever their length is.
+    Default calendar is working week from Monday 8:00 to Saturday 8:00.
+    """
+
+    def __init__(self, shift_start='08:00', shift_hours=24.,
+                 weekmask='1111100', holidays=()):
+
+        hours, minutes = (int(part) for part in shift_start.split(':'))
+
+        self.offset = (hours*3600 + minutes*60) * US_PER_SECOND
+        self.shift = int(float(shift_hours) * 3600 * US_PER_SECOND)
+        self.busdays = np.busdaycalendar(weekmask=weekmask,
+                                         holidays=np.array(holidays, dtype='datetime64[D]'))
+
+        if not 0 < self.shift <= US_PER_DAY:
+            raise ValueError(f'Shift must be from 0 to 24 hours: {shift_hours}')
+
+    def working_time(self, ts):
+        """
+        Calculates working time from EPOCH up to each timestamp.
+
+        Args:
+            self: the instance of the class;
+            ts (int or np.array): timestamps (see parse_dt);
+
+        Return:
+            working (np.array): int64 working time [us].
+        """
+
+        shifted = np.asarray(ts, dtype=np.int64) - self.offset
+        day = shifted // US_PER_DAY
+        in_day = shifted - day*US_PER_DAY
+
+        dates = day.astype('datetime64[D]')
+        full_days = np.busday_count(np.datetime64(0, 'D'), dates, busdaycal=self.busdays)
+        working_day = np.is_busday(dates, busdaycal=self.busdays)
+
+        return full_days*self.shift + np.where(working_day, np.minimum(in_day, self.shift), 0)
+
+    def working_seconds(self, start_ts, end_ts):
+        """
+        Calculates working time between timestamps.
+
+        Args:
+            self: the instance of the class;
+            start_ts (int or np.array): start timestamps;
+            end_ts (int or np.array): end timestamps;
+
+        Return:
+            seconds (np.array): working time [s].
+        """
+
+        return (self.working_time(end_ts) - self.working_time(start_ts)) / US_PER_SECOND
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,165 @@
+import os
+import hashlib
+import threading
+from pathlib import Path
+
+# Root folder of all local caches.
+CACHE_ROOT = Path(__file__).parent.parent / 'cache'
+
+def hash_key(*parts):
+    """
+    Makes hex digest of the key parts.
+
+    Args:
+        parts (str or bytes): key parts;
+
+    Return:
+        key (str): sha256 hex digest.
+    """
+
+    digest = hashlib.sha256()
+
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b'\0')
+
+    return digest.hexdigest()
+
+class DiskCache:
+    """
+    Folder of files named by a key, limited by total size.
+    Least recently used files (by modification time, which is
+    updated on every hit) are removed when the limit is exceeded.
+    Files are written atomically, so the cache may be shared
+    by threads and processes.
+    """
+
+    def __init__(self, folder, max_bytes, suffix=''):
+
+        self.folder = Path(folder)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.size = None
+        self.lock = threading.Lock()
+
+    def path(self, key):
+        """
+        Returns path of the file with 'key'.
+
+        Args:
+            self: the instance of the class;
+            key (str): file key, see hash_key.
+        """
+
+        # Two-level layout keeps folders small.
+        return self.folder / key[:2] / f'{key}{self.suffix}'
+
+    def read(self, key):
+        """
+        Reads the file with 'key' and marks it as recently used.
+
+        Args:
+            self: the instance of the class;
+            key (str): file key;
+
+        Return:
+            data (bytes or None): file content, None if there is no such file.
+        """
+
+        path = self.path(key)
+
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+
+        except OSError:
+            return None
+
+        return data
+
+    def write(self, key, data):
+        """
+        Writes 'data' to the file with 'key' and evicts
+        least recently used files if the size limit is exceeded.
+
+        Args:
+            self: the instance of the class;
+            key (str): file key;
+            data (bytes): file content.
+        """
+
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            old_size = path.stat().st_size
+
+        except OSError:
+            old_size = 0
+
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            if self.size is None:
+                self.size = self._folder_size()
+            else:
+                self.size += len(data) - old_size
+
+            if self.size > self.max_bytes:
+                self.size = self._evict()
+
+    def _files(self):
+        """
+        Returns list of (mtime, size, path) of all cache files.
+        """
+
+        files = []
+
+        for path in self.folder.glob(f'*/*{self.suffix}'):
+            try:
+                stat = path.stat()
+
+            except OSError:
+                continue
+
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        return files
+
+    def _folder_size(self):
+        """
+        Returns total size of cache files [bytes].
+        """
+
+        return sum(size for _, size, _ in self._files())
+
+    def _evict(self):
+        """
+        Removes least recently used files till the cache takes
+        at most 3/4 of max_bytes, so eviction does not run on every write.
+
+        Return:
+            size (int): cache size after eviction [bytes].
+        """
+
+        files = sorted(self._files())
+        size = sum(size for _, size, _ in files)
+        target = self.max_bytes * 3 // 4
+
+        for _, file_size, path in files:
+            if size <= target:
+                break
+
+            try:
+                path.unlink()
+                size -= file_size
+
+            except OSError:
+                continue
+
+        return size
+
+if __name__ == '__main__':
+    pass
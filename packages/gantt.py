@@ -1,55 +1,190 @@
-import concurrent.futures
-import plotly.figure_factory as ff
-from plotly.offline import plot
-from constants import LABELS, COLORS
-
-def make_gantt_charts(history, issue_name, dir_path):
-    """
-    Function creates Gantt chart for each issue in issues,
-    using plotly.figure_factory.create_gantt function and
-    saves '.html' on disk.
-    history:
-    {issue_id1: [
-        {'added': u'2018-03-19T11:24:32.866Z',
-         'id': 316,
-         'removed': u'2018-03-19T11:26:45.761Z'}
-        {'added': u'2018-04-03T08:22:17.666Z',
-         'id': 320,
-         'removed': u'2018-04-03T11:31:06.041Z'},
-         ...],
-     issue_id2: [
-         ...],
-     ...}
-
-    Args:
-        history (dict): history of label changes for each issue;
-        issue_name (string): Tool name as in issue on Gitlab;
-        dir_path (str): path to dir where Gantt charts should be saved.
-    """
-
-    # Sort history[issue_iid] by labels.keys() order.
-    data = sorted(history,
-                    key=lambda x: list(LABELS.keys()).index(x['id']))
-
-    # Reorganize data in a way, which suits ff.create_gantt() funct.
-    dataframe = []
-    for row in data:
-
-        tmp = {}
-        tmp['Task'] = LABELS[row['id']]
-        tmp['Start'] = row['added']
-        tmp['Finish'] = row['removed']
-
-        dataframe.append(tmp)
-
-    # Create Gantt chart (plotly.figure_factory.create_gantt) and
-    # save '.html' files on disk.
-    if dataframe:
-        fig = ff.create_gantt(dataframe, colors=COLORS,
-                                index_col='Task', showgrid_x=True, group_tasks=True)
-
-        plot(fig,
-                filename=str(dir_path / f'{issue_name}_GanttChart.html'), auto_open=False)
-
-if __name__ == '__main__':
-    pass
+import json
+from pathlib import Path
+import numpy as np
+import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs, plot
+from constants import LABELS, COLORS
+
+# Position of each label in LABELS, i.e. order of Gantt chart rows.
+LABEL_RANK = {label_id: rank for rank, label_id in enumerate(LABELS.keys())}
+
+# Gantt bundle: plotly.js and index page are written once,
+# each tool is a small script, which is loaded by the index page on demand.
+GANTT_JS = 'plotly.min.js'
+GANTT_INDEX = 'index.html'
+
+INDEX_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Gantt charts</title>
+<script src="{plotly_js}"></script>
+<style>
+body {{ margin: 0; font-family: sans-serif; display: flex; height: 100vh; }}
+#tools {{ width: 220px; overflow-y: auto; border-right: 1px solid #ccc; }}
+#tools a {{ display: block; padding: 4px 8px; color: #000; text-decoration: none; }}
+#tools a.selected {{ background: #ddd; }}
+#chart {{ flex: 1; }}
+</style>
+</head>
+<body>
+<div id="tools"></div>
+<div id="chart"></div>
+<script>
+var tools = {tools};
+var figures = {{}};
+
+function show(name) {{
+    var figure = figures[name];
+    Plotly.react('chart', figure.data, figure.layout, {{responsive: true}});
+}}
+
+// Called by <tool>_GanttChart.js.
+function ganttLoaded(name, figure) {{
+    figures[name] = figure;
+    show(name);
+}}
+
+function select(name, link) {{
+    var links = document.querySelectorAll('#tools a');
+    for (var i = 0; i < links.length; i++) links[i].className = '';
+    link.className = 'selected';
+
+    if (figures[name]) {{ show(name); return; }}
+
+    var script = document.createElement('script');
+    script.src = encodeURIComponent(name + '_GanttChart') + '.js';
+    script.onerror = function() {{
+        Plotly.purge('chart');
+        document.getElementById('chart').textContent = 'No Gantt chart: ' + name;
+    }};
+    document.head.appendChild(script);
+}}
+
+tools.forEach(function(name) {{
+    var link = document.createElement('a');
+    link.href = '#';
+    link.textContent = name;
+    link.onclick = function() {{ select(name, link); return false; }};
+    document.getElementById('tools').appendChild(link);
+}});
+</script>
+</body>
+</html>
+"""
+
+def gantt_figure(history):
+    """
+    Creates Gantt chart of the tool: one horizontal bar trace per label,
+    all intervals of the label are bars with 'base' = start and length = duration,
+    so the figure size does not grow with shapes per interval.
+
+    Args:
+        history (list): history of label changes of the tool (see make_gantt_charts);
+
+    Return:
+        fig (plotly Figure or None): Gantt chart, None if history is empty.
+    """
+
+    if not history:
+        return None
+
+    rank = np.fromiter((LABEL_RANK[row['id']] for row in history),
+                       dtype=np.intp, count=len(history))
+    added = np.fromiter((row['added'] for row in history),
+                        dtype=np.int64, count=len(history))
+    removed = np.fromiter((row['removed'] for row in history),
+                          dtype=np.int64, count=len(history))
+
+    # Date axis takes milliseconds since epoch.
+    start = added // 1000
+    duration = (removed - added) // 1000
+
+    fig = go.Figure()
+
+    for label_rank, (label_id, name) in enumerate(LABELS.items()):
+        selected = rank == label_rank
+
+        if not selected.any():
+            continue
+
+        fig.add_trace(go.Bar(
+            y=[name] * int(selected.sum()),
+            base=start[selected],
+            x=duration[selected],
+            customdata=duration[selected] / 3600000.,
+            orientation='h',
+            name=name,
+            marker_color=COLORS[name],
+            hovertemplate='%{y}: %{customdata:.2f} h<extra></extra>'))
+
+    fig.update_layout(
+        title='Gantt Chart',
+        barmode='overlay',
+        bargap=0.2,
+        xaxis=dict(type='date', showgrid=True,
+                   rangeselector=dict(buttons=[
+                       dict(count=7, label='1w', step='day', stepmode='backward'),
+                       dict(count=1, label='1m', step='month', stepmode='backward'),
+                       dict(count=6, label='6m', step='month', stepmode='backward'),
+                       dict(count=1, label='YTD', step='year', stepmode='todate'),
+                       dict(count=1, label='1y', step='year', stepmode='backward'),
+                       dict(step='all')])),
+        yaxis=dict(categoryorder='array', categoryarray=list(LABELS.values())[::-1]))
+
+    return fig
+
+def make_gantt_charts(history, issue_name, dir_path, bundle=True):
+    """
+    Function creates Gantt chart of the tool and saves it on disk:
+    as <issue_name>_GanttChart.js of the Gantt bundle (see write_gantt_bundle)
+    or as standalone <issue_name>_GanttChart.html with plotly.js inside.
+    history:
+    [{'added': 1521458672866000,
+      'id': 316,
+      'removed': 1521458805761000}
+     {'added': 1522743737666000,
+      'id': 320,
+      'removed': 1522755066041000},
+     ...]
+
+    Args:
+        history (list): history of label changes of the tool;
+        issue_name (string): Tool name as in issue on Gitlab;
+        dir_path (Path object): path to dir where Gantt charts should be saved;
+        bundle (bool, default=True): if False, standalone .html is saved.
+    """
+
+    fig = gantt_figure(history)
+
+    if fig is None:
+        return
+
+    if bundle:
+        script = f'ganttLoaded({json.dumps(issue_name)}, {fig.to_json()});\n'
+        (Path(dir_path) / f'{issue_name}_GanttChart.js').write_text(script, encoding='utf-8')
+
+    else:
+        plot(fig,
+                filename=str(Path(dir_path) / f'{issue_name}_GanttChart.html'), auto_open=False)
+
+def write_gantt_bundle(dir_path, issue_names):
+    """
+    Writes plotly.js and index page of the Gantt bundle,
+    index page lists the tools and loads their charts on demand.
+
+    Args:
+        dir_path (Path object): path to dir of Gantt charts;
+        issue_names (list): tool names as in issues on Gitlab.
+    """
+
+    dir_path = Path(dir_path)
+    (dir_path / GANTT_JS).write_text(get_plotlyjs(), encoding='utf-8')
+
+    # '</' is escaped, so tool names can not close the script tag.
+    tools = json.dumps(list(issue_names)).replace('</', '<\\/')
+    (dir_path / GANTT_INDEX).write_text(INDEX_TEMPLATE.format(plotly_js=GANTT_JS, tools=tools),
+                                        encoding='utf-8')
+
+if __name__ == '__main__':
+    pass
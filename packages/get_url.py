@@ -1,56 +1,140 @@
-import requests
-import concurrent.futures
-from constants import HEADERS
-
-# response.status_code == 200 OK
-
-def get_url(url, page):
-    """
-    Makes HTTP GET request to singlepage url with headers.
-
-    Args:
-        url (str): webpage url;
-        page (dict): page to request;
-
-    Return:
-        response.json() (list): list with JSON decoded url content.
-    """
-
-    params = f'per_page=100&page={page}'
-    full_url = f'{url}?{params}'
-
-    response = requests.get(full_url, headers=HEADERS)
-
-    response.raise_for_status()
-
-    return response.json()
-
-def get_multipage_url(url, starting_page=1):
-    """
-    Makes HTTP GET request to multipage url with headers.
-
-    Args:
-        url (str): webpage url;
-        starting_page (int): first page to request;
-
-    Return:
-        response (list): list with JSON decoded multipage url content.
-        num_of_pages (int): max page in the response
-    """
-
-    response = []
-    num_of_pages = requests.get(f'{url}?per_page=100', headers=HEADERS) 
-    num_of_pages = int(num_of_pages.headers['x-Total-Pages'])
-        
-    if starting_page <= num_of_pages:
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            results = executor.map(
-                get_url, [url] * num_of_pages, range(starting_page, num_of_pages + 1))
-
-        for page in results:
-            response += page
-
-        return response, num_of_pages
-
-if __name__ == '__main__':
-    pass
+import concurrent.futures
+from requests.utils import parse_header_links
+from constants import HEADERS
+from session import get_session
+from http_cache import cached_response, conditional_headers, load_entry, save_entry
+from scheduler import get_scheduler
+
+# response.status_code == 200 OK
+
+def page_url(url, page):
+    """
+    Returns url of the page with 100 entries per page.
+
+    Args:
+        url (str): webpage url, may already contain a query;
+        page (int): page to request;
+    """
+
+    separator = '&' if '?' in url else '?'
+
+    return f'{url}{separator}per_page=100&page={page}'
+
+def next_page_url(url, headers):
+    """
+    Finds url of the next page from GitLab pagination headers.
+    'x-next-page' is used when it is sent (empty on the last page),
+    otherwise 'rel="next"' of Link header (keyset pagination).
+
+    Args:
+        url (str): webpage url;
+        headers (dict-like): case-insensitive response headers;
+
+    Return:
+        next_url (str or None): url of the next page, None for the last page.
+    """
+
+    if 'x-next-page' in headers:
+        next_page = headers['x-next-page']
+        return page_url(url, next_page) if next_page else None
+
+    for link in parse_header_links(headers.get('Link', '')):
+        if link.get('rel') == 'next':
+            return link['url']
+
+    return None
+
+def _get(full_url):
+    """
+    Makes HTTP GET request to full_url with headers.
+    Request goes through the shared scheduler, which retries
+    failed requests and slows down when Gitlab asks for it.
+    If the page is cached, the request is conditional and
+    304 Not Modified is served from the cache.
+
+    Args:
+        full_url (str): webpage url with query;
+
+    Return:
+        body (list): JSON decoded content;
+        headers (CaseInsensitiveDict): response headers.
+    """
+
+    entry = load_entry(full_url)
+    headers = dict(HEADERS, **conditional_headers(entry))
+
+    response = get_scheduler().request(
+        lambda: get_session().get(full_url, headers=headers))
+
+    response.raise_for_status()
+
+    if entry and response.status_code == 304:
+        return cached_response(entry, response.headers)
+
+    body = response.json()
+    save_entry(full_url, body, response.headers)
+
+    return body, response.headers
+
+def get_url(url, page):
+    """
+    Makes HTTP GET request to singlepage url with headers.
+
+    Args:
+        url (str): webpage url;
+        page (dict): page to request;
+
+    Return:
+        response.json() (list): list with JSON decoded url content.
+    """
+
+    body, _ = _get(page_url(url, page))
+
+    return body
+
+def get_multipage_url(url, starting_page=1):
+    """
+    Makes HTTP GET request to multipage url with headers.
+    The first requested page is used both for content and
+    for 'x-Total-Pages'. If the header is absent (GitLab omits it
+    for more than 10000 rows), pages are requested one by one
+    following 'x-next-page' / Link headers.
+
+    Args:
+        url (str): webpage url;
+        starting_page (int): first page to request;
+
+    Return:
+        response (list): list with JSON decoded multipage url content.
+        num_of_pages (int): max page in the response
+    """
+
+    response, headers = _get(page_url(url, starting_page))
+
+    if 'x-Total-Pages' in headers:
+        num_of_pages = int(headers['x-Total-Pages'])
+
+        if starting_page < num_of_pages:
+            pages = range(starting_page + 1, num_of_pages + 1)
+
+            with concurrent.futures.ThreadPoolExecutor() as executor:
+                results = executor.map(get_url, [url] * len(pages), pages)
+
+            for page in results:
+                response += page
+
+        return response, max(num_of_pages, 1)
+
+    num_of_pages = starting_page
+    next_url = next_page_url(url, headers)
+
+    while next_url:
+        page, headers = _get(next_url)
+        response += page
+        num_of_pages += 1
+        next_url = next_page_url(url, headers)
+
+    return response, num_of_pages
+
+if __name__ == '__main__':
+    pass
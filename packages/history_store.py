@@ -0,0 +1,213 @@
+import sys
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from constants import LABELS
+from datetimes import parse_dt
+from json_handler import load_json
+
+HISTORY_FOLDER = Path('./history')
+HISTORY_DB = 'history.sqlite'
+
+# Actions are stored as integers, so (ts, action) sorts 'add' before 'remove'.
+ACTIONS = ('add', 'remove')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS labels (id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL);
+CREATE TABLE IF NOT EXISTS events (
+    tool TEXT NOT NULL,
+    key TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    label INTEGER NOT NULL,
+    action INTEGER NOT NULL,
+    user INTEGER NOT NULL,
+    PRIMARY KEY (tool, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS events_by_time ON events (tool, ts, action);
+CREATE TABLE IF NOT EXISTS meta (
+    tool TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (tool, key)
+) WITHOUT ROWID;
+"""
+
+# Keys of saved history, which are not events.
+META_KEYS = ('ID offset', 'Old API cursor', 'New API cursor', 'Last new API page')
+
+_write_lock = threading.Lock()
+
+def _connect(folder=HISTORY_FOLDER):
+    """
+    Opens history database, creating its tables on first use.
+
+    Args:
+        folder (Path, default=HISTORY_FOLDER): history folder;
+
+    Return:
+        connection (sqlite3.Connection): database connection.
+    """
+
+    folder = Path(folder).resolve()
+    folder.mkdir(exist_ok=True)
+
+    connection = sqlite3.connect(folder / HISTORY_DB, timeout=60.)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    connection.executescript(SCHEMA)
+
+    return connection
+
+def load_history(issue_name, issue_id, folder=HISTORY_FOLDER):
+    """
+    Loads saved history of the tool in the form of history/<issue_name>.json,
+    i.e. {issue_id: {message_id: entry}, 'ID offset': ..., <cursors>},
+    where entry 'date' is replaced by 'ts' timestamp (see datetimes.parse_dt).
+    History is imported from history/<issue_name>.json,
+    if the tool is not in the database yet.
+
+    Args:
+        issue_name (str): tool name as in issue on Gitlab;
+        issue_id (int): id of issue in question;
+        folder (Path, default=HISTORY_FOLDER): history folder;
+
+    Return:
+        history (dict or None): saved history, None if there is no such tool.
+    """
+
+    connection = _connect(folder)
+
+    try:
+        meta = dict(connection.execute(
+            'SELECT key, value FROM meta WHERE tool = ?', (issue_name,)).fetchall())
+
+        if not meta:
+            json_file = Path(folder).resolve() / f'{issue_name}.json'
+
+            if not json_file.exists():
+                return None
+
+            import_json_history(json_file, issue_name, issue_id, folder)
+
+            meta = dict(connection.execute(
+                'SELECT key, value FROM meta WHERE tool = ?', (issue_name,)).fetchall())
+
+        labels = dict(connection.execute('SELECT id, name FROM labels'))
+        users = dict(connection.execute('SELECT id, name FROM users'))
+
+        rows = connection.execute(
+            'SELECT key, ts, label, action, user FROM events '
+            'WHERE tool = ? ORDER BY ts, action', (issue_name,))
+
+        history = {issue_id: {key: {'ts': ts,
+                                    'label': labels[label],
+                                    'user': users[user],
+                                    'action': ACTIONS[action]}
+                              for key, ts, label, action, user in rows}}
+
+    finally:
+        connection.close()
+
+    history.update({key: json.loads(value) for key, value in meta.items()})
+
+    return history
+
+def append_history(issue_name, entries, meta, folder=HISTORY_FOLDER):
+    """
+    Appends new history entries and replaces meta data of the tool
+    in one transaction. Already stored entries are never rewritten.
+
+    Args:
+        issue_name (str): tool name as in issue on Gitlab;
+        entries (dict): {message_id: entry} to append, entry as in load_history;
+        meta (dict): 'ID offset' and cursors to save;
+        folder (Path, default=HISTORY_FOLDER): history folder.
+    """
+
+    label_ids = {name: int(label_id) for label_id, name in LABELS.items()}
+
+    with _write_lock:
+        connection = _connect(folder)
+
+        try:
+            with connection:
+                connection.executemany('INSERT OR REPLACE INTO labels (id, name) VALUES (?, ?)',
+                                       [(label_id, name) for name, label_id in label_ids.items()])
+
+                names = {entry['user'] for entry in entries.values()}
+                connection.executemany('INSERT OR IGNORE INTO users (name) VALUES (?)',
+                                       [(name,) for name in names])
+                users = {name: user_id for user_id, name in connection.execute('SELECT id, name FROM users')}
+
+                connection.executemany(
+                    'INSERT OR IGNORE INTO events (tool, key, ts, label, action, user) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    [(issue_name, str(key), entry['ts'], label_ids[entry['label']],
+                      ACTIONS.index(entry['action']), users[entry['user']])
+                     for key, entry in entries.items()])
+
+                connection.execute('DELETE FROM meta WHERE tool = ?', (issue_name,))
+                connection.executemany('INSERT INTO meta (tool, key, value) VALUES (?, ?, ?)',
+                                       [(issue_name, key, json.dumps(value))
+                                        for key, value in meta.items() if key in META_KEYS])
+
+        finally:
+            connection.close()
+
+def import_json_history(json_file, issue_name, issue_id=None, folder=HISTORY_FOLDER):
+    """
+    Imports history/<issue_name>.json (format of save_to_json) into the database.
+
+    Args:
+        json_file (Path object): path to .json file;
+        issue_name (str): tool name as in issue on Gitlab;
+        issue_id (int, default=None): id of issue, if None, the only
+                                      non meta key of the file is used;
+        folder (Path, default=HISTORY_FOLDER): history folder.
+    """
+
+    history = load_json(json_file)
+    meta = {key: history.pop(key) for key in META_KEYS if key in history}
+
+    key = str(issue_id) if issue_id is not None else next(iter(history), None)
+    entries = {message_id: dict(entry, ts=parse_dt(entry['date']))
+               for message_id, entry in history.get(key, {}).items()}
+
+    append_history(issue_name, entries, meta, folder)
+
+def import_json_folder(folder=HISTORY_FOLDER):
+    """
+    Imports all history/*.json files, which are not in the database yet.
+
+    Args:
+        folder (Path, default=HISTORY_FOLDER): history folder;
+
+    Return:
+        imported (list): names of imported tools.
+    """
+
+    connection = _connect(folder)
+
+    try:
+        stored = {tool for tool, in connection.execute('SELECT DISTINCT tool FROM meta')}
+
+    finally:
+        connection.close()
+
+    imported = []
+
+    for json_file in sorted(Path(folder).resolve().glob('*.json')):
+        if json_file.stem not in stored:
+            import_json_history(json_file, json_file.stem, folder=folder)
+            imported.append(json_file.stem)
+
+    return imported
+
+if __name__ == '__main__':
+    for name in import_json_folder():
+        print(f'Imported: {name}')
@@ -0,0 +1,161 @@
+import sys
+import json
+import threading
+from pathlib import Path
+from requests.structures import CaseInsensitiveDict
+
+sys.path.append(str(Path(__file__).parent))
+
+from disk_cache import CACHE_ROOT, DiskCache, hash_key
+
+HTTP_CACHE_FOLDER = CACHE_ROOT / 'http'
+HTTP_CACHE_MAX_BYTES = 512 * 2**20
+
+# Response headers, which are needed to page through cached responses.
+KEPT_HEADERS = ('x-total-pages', 'x-next-page', 'Link')
+
+_cache = DiskCache(HTTP_CACHE_FOLDER, HTTP_CACHE_MAX_BYTES, suffix='.json')
+_enabled = True
+_counters = {'hits': 0, 'misses': 0}
+_counters_lock = threading.Lock()
+
+def configure_http_cache(enabled=True,
+                         max_bytes=HTTP_CACHE_MAX_BYTES, folder=HTTP_CACHE_FOLDER):
+    """
+    Sets HTTP response cache options.
+
+    Args:
+        enabled (bool, default=True): whether conditional requests are used;
+        max_bytes (int, default=HTTP_CACHE_MAX_BYTES): cache size limit;
+        folder (Path, default=HTTP_CACHE_FOLDER): cache folder.
+    """
+
+    global _cache, _enabled
+
+    _enabled = bool(enabled)
+    _cache = DiskCache(folder, int(max_bytes), suffix='.json')
+
+def load_entry(full_url):
+    """
+    Loads cached response of full_url.
+
+    Args:
+        full_url (str): webpage url with query (page included);
+
+    Return:
+        entry (dict or None): cached 'body', 'headers', 'etag' and 'last_modified'.
+    """
+
+    if not _enabled:
+        return None
+
+    data = _cache.read(hash_key(full_url))
+
+    if data is None:
+        return None
+
+    try:
+        entry = json.loads(data)
+
+    except ValueError:
+        return None
+
+    return entry if entry.get('url') == full_url else None
+
+def conditional_headers(entry):
+    """
+    Makes If-None-Match / If-Modified-Since headers for cached entry.
+
+    Args:
+        entry (dict or None): see load_entry;
+
+    Return:
+        headers (dict): conditional request headers.
+    """
+
+    headers = {}
+
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    return headers
+
+def cached_response(entry, headers):
+    """
+    Returns content of cached entry, it is called on 304 Not Modified.
+    ETag covers only the page content, while pages may be added after it,
+    so pagination headers of the 304 response replace the cached ones.
+
+    Args:
+        entry (dict): see load_entry;
+        headers (dict-like): case-insensitive headers of the 304 response;
+
+    Return:
+        body (list), headers (CaseInsensitiveDict): cached content and headers.
+    """
+
+    _count('hits')
+
+    merged = CaseInsensitiveDict(entry['headers'])
+
+    for key in KEPT_HEADERS:
+        if key in headers:
+            merged[key] = headers[key]
+
+    return entry['body'], merged
+
+def save_entry(full_url, body, headers):
+    """
+    Saves response to the cache, if it can be validated later
+    (i.e. has ETag or Last-Modified header).
+
+    Args:
+        full_url (str): webpage url with query (page included);
+        body (list): JSON decoded content;
+        headers (dict-like): case-insensitive response headers.
+    """
+
+    _count('misses')
+
+    if not _enabled:
+        return
+
+    etag = headers.get('ETag')
+    last_modified = headers.get('Last-Modified')
+
+    if not (etag or last_modified):
+        return
+
+    entry = {
+        'url': full_url,
+        'etag': etag,
+        'last_modified': last_modified,
+        'headers': {key: headers[key] for key in KEPT_HEADERS if key in headers},
+        'body': body
+    }
+
+    _cache.write(hash_key(full_url), json.dumps(entry, separators=(',', ':')).encode())
+
+def http_cache_stats():
+    """
+    Return:
+        stats (dict): number of responses served from cache ('hits')
+                      and downloaded ('misses').
+    """
+
+    with _counters_lock:
+        return dict(_counters)
+
+def _count(name):
+    """
+    Increments counter 'name' by one.
+    """
+
+    with _counters_lock:
+        _counters[name] += 1
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,106 @@
+import sys
+from pathlib import Path
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent))
+
+from constants import LABELS
+from datetimes import US_PER_SECOND
+
+class IntervalIndex:
+    """
+    Sorted index of label intervals of each issue (tool), built once from
+    history (see timetable.timetable_arrays). Intervals are sorted by
+    'added' and the running maximum of 'removed' is kept, so intervals
+    overlapping a window are found by two binary searches.
+    History is never modified, windows are returned as new arrays.
+    """
+
+    def __init__(self, history, labels=LABELS):
+
+        self.label_ids = list(labels.keys())
+        label_index = {label_id: i for i, label_id in enumerate(self.label_ids)}
+        self.tools = {}
+
+        for iid, data in history.items():
+            start = np.fromiter((entry['added'] for entry in data),
+                                dtype=np.int64, count=len(data))
+            end = np.fromiter((entry['removed'] for entry in data),
+                              dtype=np.int64, count=len(data))
+            label = np.fromiter((label_index[entry['id']] for entry in data),
+                                dtype=np.intp, count=len(data))
+
+            order = np.argsort(start, kind='stable')
+            rank = np.empty_like(order)
+            rank[order] = np.arange(len(order))
+
+            self.tools[iid] = {
+                'order': order,
+                'rank': rank,
+                'start': start[order],
+                'end': end[order],
+                'max_end': np.maximum.accumulate(end[order]) if len(data) else end,
+                'label': label
+            }
+
+    def positions(self, iid, start_ts, end_ts):
+        """
+        Finds intervals of the tool which overlap [start_ts, end_ts], i.e.
+        'added' < end_ts and 'removed' > start_ts.
+
+        Args:
+            self: the instance of the class;
+            iid (int): issue id;
+            start_ts (int): window start timestamp (see datetimes.to_epoch);
+            end_ts (int): window end timestamp;
+
+        Return:
+            positions (np.array): positions of intervals in history[iid], ascending.
+        """
+
+        tool = self.tools[iid]
+
+        # Intervals before 'lo' end before the window, from 'hi' start after it.
+        lo = np.searchsorted(tool['max_end'], start_ts, side='right')
+        hi = np.searchsorted(tool['start'], end_ts, side='left')
+
+        positions = tool['order'][lo:hi][tool['end'][lo:hi] > start_ts]
+        positions.sort()
+
+        return positions
+
+    def window_arrays(self, start_ts, end_ts, calendar=None):
+        """
+        Returns intervals of all tools clipped to [start_ts, end_ts]
+        in the form of timetable.timetable_arrays, without making entries.
+
+        Args:
+            self: the instance of the class;
+            start_ts (int): window start timestamp;
+            end_ts (int): window end timestamp;
+            calendar (WorkCalendar, default=None): working calendar for 'seconds'
+                                                   (see datetimes.WorkCalendar);
+
+        Return:
+            arrays (dict): {issue_id: {'label', 'start', 'end', 'seconds'}}.
+        """
+
+        arrays = {}
+
+        for iid, tool in self.tools.items():
+            positions = self.positions(iid, start_ts, end_ts)
+            order = tool['rank'][positions]
+
+            start = np.maximum(tool['start'][order], start_ts)
+            end = np.minimum(tool['end'][order], end_ts)
+
+            seconds = calendar.working_seconds(start, end) if calendar\
+                      else (end - start) / US_PER_SECOND
+
+            arrays[iid] = {'label': tool['label'][positions], 'start': start, 'end': end,
+                           'seconds': seconds}
+
+        return arrays
+
+if __name__ == '__main__':
+    pass
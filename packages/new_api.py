@@ -1,174 +1,234 @@
-
-import sys
-import concurrent.futures
-from pathlib import Path
-
-sys.path.append(str(Path(__file__).parent))
-
-from get_url import get_multipage_url
-from constants import PROJ_URL, END, DT_FORMAT, LABELS, COLORS
-from json_handler import load_json, save_to_json
-from datetime import datetime 
-
-def filter_data(response, id_offset):
-    """Trim any excess data from raw Gitlab API response.
-
-    Args:
-        response (dictionary): Raw Gitlab API response
-    Returns:
-        (dictionary): filtered tool history 
-        Unit example:
-        "<issue_id>":{
-            "<message_id>":{
-                "date"  : "date",
-                "action": "add / removed",
-                "label" : "",
-                "user"  : "full name"
-            }
-		}
-    """  
-
-    formatted_history = {}
-    for message in response:
-        try:
-            label_id = message['label']['id']
-            message_id = message['id']
-            if str(label_id) in LABELS:
-                formatted_history[str(id_offset + message_id)] =\
-                    {
-                        'date': message['created_at'],
-                        'label': message['label']['name'],
-                        'user': message['user']['name'],
-                        'action': message['action']
-                    }
-            else:
-                continue
-        except:
-            # Ignore deleted labels
-            continue
-    return formatted_history
-
-def download_history(old_history, issue, url=PROJ_URL):
-    """
-    Downloads history of issue labels change by new Gitlab API, since GitLab 11.3 version.
-
-    Args:
-        issues (dict): dict with project issues: (issue_iid, issue_title);
-        labels (dict): dict with project issues: (label_id, label_name);
-        url (string, default=PROJ_URL): project url;
-
-    Return:
-        history (dict): dict with (key, value) = (issue_iid, list with history of labels change)
-        Unit example:
-        "<issue_id>":{
-            "<message_id>":{
-                "date"  : "date",
-                "action": "add / removed",
-                "label" : "",
-                "user"  : "full name"
-            }
-		}
-    """
-    issue_id = issue[0]
-    issue_name = issue[1]
-    
-    issue_file = Path(fr'./history/{issue_name}.json').resolve()
-    id_offset = int(old_history['ID offset'])
-    page_offset = old_history['Last new API page'] if 'Last new API page' in old_history else 1
-    
-    full_url = f'{url}/issues/{issue_id}/resource_label_events'
-    issue_history, page_offset = get_multipage_url(url=full_url, starting_page=page_offset)
-    old_history['Last new API page'] = page_offset
-    
-    issue_history = filter_data(issue_history, id_offset)
-    old_history[issue_id].update(issue_history)
-
-    old_history[issue_id] =\
-        {
-            key: value for key, value in sorted(old_history[issue_id].items(), key=\
-                lambda x: (
-                datetime.strptime(x[1]['date'], DT_FORMAT),
-                x[1]['action']))
-        }
-    save_to_json(issue_file, old_history)
-    
-    # Change format from long-term storage to more pliable
-    del old_history['Last new API page']
-    del old_history['ID offset']
-    old_history[issue_id] = [value for value in old_history[issue_id].values()]
-    
-    return old_history
-
-def to_new_form(input_history):
-    """
-    Transforms input history to new format.
-    Walks through input history, setting the date to corresponding label.
-    If both dates are set, appends to the result
-
-    input_history form:
-        [{'action': 'add',
-            'date': '2018-03-27T07:09:46.768Z',
-            'label': '',
-            'user': ''
-        },
-        {'action': 'remove',
-            'date': '2018-03-27T07:09:46.768Z',
-            'label': '', 'user': ''
-        }, 
-        ...]
-     output_history form:
-        {issue_id1: [
-            {'added': u'2018-03-19T11:24:32.866Z',
-             'id': 316,
-             'removed': u'2018-03-19T11:26:45.761Z'}
-            {'added': u'2018-04-03T08:22:17.666Z',
-             'id': 320,
-             'removed': u'2018-04-03T11:31:06.041Z'},
-            ...],
-         issue_id2:[
-            ...],
-         ...}
-
-    Args:
-        input_history (dict): input data to be transformed;
-
-    Return:
-        output_history (dict): output data in new form.
-    """
-
-    output_history = {}
-
-    for iid, hist in input_history.items():
-        data = []
-        tmp = {label:
-               {
-                   'id': key,
-                   'added': None,
-                   'removed': None
-               } for key, label in LABELS.items()}
-
-        for entry in hist:
-            label_name = entry['label']
-            
-            if entry['action'] == 'add':
-                tmp[label_name]['added'] = entry['date']
-                tmp[label_name]['removed'] = None
-            
-            elif entry['action'] == 'remove':
-                tmp[label_name]['removed'] = entry['date']
-
-            if tmp[label_name]['removed'] and tmp[label_name]['added']:
-                data.append(tmp[label_name].copy())
-                tmp[label_name]['added'] = None
-                tmp[label_name]['removed'] = None
-
-        for entry in tmp.values():
-            if entry['added'] != None and entry['removed'] == None:
-                entry['removed'] = END.strftime(DT_FORMAT)
-                data.append(entry)
-
-        output_history[iid] = data
-    return output_history
-
-if __name__ == '__main__':
-    pass
+
+import sys
+import concurrent.futures
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from get_url import get_multipage_url
+from constants import PROJ_URL, END, LABELS, COLORS
+from datetimes import parse_dt, to_epoch
+from history_store import append_history
+
+# Number of events on a page of /resource_label_events, see get_url.page_url.
+EVENTS_PER_PAGE = 100
+
+def filter_data(response, id_offset):
+    """Trim any excess data from raw Gitlab API response.
+
+    Args:
+        response (dictionary): Raw Gitlab API response
+    Returns:
+        (dictionary): filtered tool history 
+        Unit example:
+        "<issue_id>":{
+            "<message_id>":{
+                "ts"    : created_at [us since epoch],
+                "action": "add / removed",
+                "label" : "",
+                "user"  : "full name"
+            }
+		}
+    """  
+
+    formatted_history = {}
+    for message in response:
+        try:
+            label_id = message['label']['id']
+            message_id = message['id']
+            if str(label_id) in LABELS:
+                formatted_history[str(id_offset + message_id)] =\
+                    {
+                        'ts': parse_dt(message['created_at']),
+                        'label': message['label']['name'],
+                        'user': message['user']['name'],
+                        'action': message['action']
+                    }
+            else:
+                continue
+        except:
+            # Ignore deleted labels
+            continue
+    return formatted_history
+
+def download_history(old_history, issue, url=PROJ_URL):
+    """
+    Downloads history of issue labels change by new Gitlab API, since GitLab 11.3 version.
+    Only the page with the last saved event ('New API cursor') and
+    the following pages are requested, only events above the cursor are merged.
+
+    Args:
+        issues (dict): dict with project issues: (issue_iid, issue_title);
+        labels (dict): dict with project issues: (label_id, label_name);
+        url (string, default=PROJ_URL): project url;
+
+    Return:
+        history (dict): dict with (key, value) = (issue_iid, list with history of labels change)
+        Unit example:
+        "<issue_id>":{
+            "<message_id>":{
+                "ts"    : created_at [us since epoch],
+                "action": "add / removed",
+                "label" : "",
+                "user"  : "full name"
+            }
+		}
+    """
+    issue_id = issue[0]
+    page_offset = events_start_page(old_history)
+    
+    full_url = f'{url}/issues/{issue_id}/resource_label_events'
+    issue_history, _ = get_multipage_url(url=full_url, starting_page=page_offset)
+
+    # Earlier events were deleted and the cursor moved to previous pages.
+    while page_offset > 1 and events_missed(old_history, issue_history):
+        page_offset -= 1
+        issue_history, _ = get_multipage_url(url=full_url, starting_page=page_offset)
+
+    return merge_history(old_history, issue, issue_history, page_offset)
+
+def events_start_page(old_history):
+    """
+    Finds page of /resource_label_events with the last saved event.
+
+    Args:
+        old_history (dict): history returned by download_old_history;
+
+    Return:
+        page (int): first page to request.
+    """
+
+    cursor = old_history.get('New API cursor')
+
+    if cursor:
+        return max(cursor['count'] - 1, 0) // EVENTS_PER_PAGE + 1
+
+    # History saved before the cursor was introduced.
+    return old_history.get('Last new API page', 1)
+
+def events_missed(old_history, events):
+    """
+    Checks whether events requested from events_start_page()
+    start after the saved cursor, i.e. some events could be skipped.
+
+    Args:
+        old_history (dict): history returned by download_old_history;
+        events (list): JSON decoded /resource_label_events pages;
+    """
+
+    cursor = old_history.get('New API cursor')
+
+    if not cursor:
+        return False
+
+    return not events or min(event['id'] for event in events) > cursor['id']
+
+def merge_history(old_history, issue, issue_history, page_offset):
+    """
+    Merges events above 'New API cursor' from raw /resource_label_events
+    response into old_history, moves the cursor, appends new events to
+    the history store and changes its format from long-term
+    storage to more pliable.
+
+    Args:
+        old_history (dict): history returned by download_old_history;
+        issue (tuple): (issue_iid, issue_title);
+        issue_history (list): JSON decoded /resource_label_events pages;
+        page_offset (int): first downloaded page;
+
+    Return:
+        history (dict): see download_history.
+    """
+
+    issue_id = issue[0]
+    issue_name = issue[1]
+
+    id_offset = int(old_history['ID offset'])
+
+    cursor = old_history.get('New API cursor', {'id': 0, 'count': 0})
+    events = [event for event in issue_history if event['id'] > cursor['id']]
+
+    if issue_history:
+        old_history['New API cursor'] =\
+            {
+                'id': max(cursor['id'], max(event['id'] for event in issue_history)),
+                'count': (page_offset - 1) * EVENTS_PER_PAGE + len(issue_history)
+            }
+        old_history.pop('Last new API page', None)
+
+    # Message ids are unique, so repeated events are merged by them.
+    issue_history = filter_data(events, id_offset)
+    old_history[issue_id].update(issue_history)
+    append_history(issue_name, issue_history, old_history)
+
+    old_history[issue_id] =\
+        {
+            key: value for key, value in sorted(old_history[issue_id].items(), key=\
+                lambda x: (x[1]['ts'], x[1]['action']))
+        }
+
+    # Change format from long-term storage to more pliable
+    return {issue_id: [value for value in old_history[issue_id].values()]}
+
+def pair_events(events, end_ts=None):
+    """
+    Generator of label intervals of one issue (tool):
+    walks through events, setting the timestamp to corresponding label,
+    and yields an interval as soon as both timestamps are set.
+    Labels, which are not removed, are yielded at the end with 'removed' = end_ts.
+    Timestamps are microseconds since epoch (see datetimes.parse_dt).
+
+    events form:
+        [{'action': 'add',
+            'ts': 1522134586768000,
+            'label': '',
+            'user': ''
+        },
+        {'action': 'remove',
+            'ts': 1522134586768000,
+            'label': '', 'user': ''
+        },
+        ...]
+    intervals form:
+        {'added': 1521458672866000,
+         'id': 316,
+         'removed': 1521458805761000}
+
+    Args:
+        events (iterable): events of the issue, see download_history;
+        end_ts (int, default=None): timestamp of open intervals end, END if None;
+
+    Return:
+        intervals (generator): {'id', 'added', 'removed'} dicts.
+    """
+
+    end_ts = to_epoch(END) if end_ts is None else end_ts
+    tmp = {label:
+           {
+               'id': key,
+               'added': None,
+               'removed': None
+           } for key, label in LABELS.items()}
+
+    for entry in events:
+        label_name = entry['label']
+
+        if entry['action'] == 'add':
+            tmp[label_name]['added'] = entry['ts']
+            tmp[label_name]['removed'] = None
+
+        elif entry['action'] == 'remove':
+            tmp[label_name]['removed'] = entry['ts']
+
+        if tmp[label_name]['removed'] and tmp[label_name]['added']:
+            yield tmp[label_name].copy()
+            tmp[label_name]['added'] = None
+            tmp[label_name]['removed'] = None
+
+    for entry in tmp.values():
+        if entry['added'] != None and entry['removed'] == None:
+            entry['removed'] = end_ts
+            yield entry
+
+if __name__ == '__main__':
+    pass
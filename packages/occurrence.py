@@ -1,98 +1,205 @@
-import concurrent.futures
-from io import BytesIO
-import matplotlib.pyplot as plt
-from numpy import array
-from matplotlib.ticker import MaxNLocator
-from numpy import inf, histogram
-from constants import LABELS, COLORS
-
-def occurrence_curve(data, fig_title):
-    """
-    Function creates occurrence curve (for all labels) for particular issue.
-    x axis: time edges, ['<1 hour', '1/2 day', '1 day',
-                         '2 days', '1 week', '>1 week']
-    y_axis: amount of issue (tool) occurrences in time edges.
-
-    data:
-        [{'days': 0.12064253472222221,
-          'hours': 2.895420833333333,
-          'id': label_id1,
-          'minutes': 173.72525,
-          'seconds': 10423.515},
-         {'days': 0.12064253472222221,
-          'hours': 2.895420833333333,
-          'id': label_id2,
-          'minutes': 173.72525,
-          'seconds': 10423.515},
-          ...,
-         {'days': 0.12064253472222221,
-          'hours': 2.895420833333333,
-          'id': label_idN,
-          'minutes': 173.72525,
-          'seconds': 10423.515}]
-
-    Args:
-        data (list of dicts): data for occurrence curve;
-        fig_title (str): occurrence curve title;
-
-    Return:
-        image (io.BytesIO obj): BytesIO obj with occurrence curve.
-    """
-
-    # Prepare data for occurrence curve.
-    bins = [0, 1, 4, 10, 34, 120, inf] # bins edges, [hours]
-    ticklabels = ['<1 hour', '1/2 day', '1 day',
-                  '2 days', '1 week', '>1 week']
-    color = [COLORS[val] for val in LABELS.values()]
-
-    hist_data = {label:[] for label in LABELS.keys()}
-    for row in data:
-        hist_data[row['id']].append(row['hours'])
-    hist_data = list(hist_data.values())
-
-    # Create occurrence curve plot.
-    fig_width, fig_height = 16., 9.
-    nrows, ncols = 3, 3
-    fig, axes = plt.subplots(figsize=(fig_width, fig_height),
-                             nrows=nrows, ncols=ncols)
-
-    legend = []
-    for i, row in enumerate(hist_data):
-
-        # Customize subplots: set title, grid and etc.
-        ax_row, ax_col = (i//ncols, i%ncols)
-        axes[ax_row, ax_col].yaxis.set_major_locator(MaxNLocator(integer=True))
-
-        # Create barplot for each label.
-        if row:
-            hist, _ = histogram(row, bins)
-            ax_bar = axes[ax_row, ax_col].bar(range(len(hist)), hist,
-                                              width=0.8, align='center',
-                                              label=list(LABELS.values())[i],
-                                              color=color[i], tick_label=ticklabels)
-            # Add numbers to bar plot.
-            for x_coord, y_coord in enumerate(hist):
-
-                if y_coord > 0:
-                    axes[ax_row, ax_col].text(x_coord, y_coord,
-                                              str(y_coord), color='black', fontsize=8)
-
-            legend.append([ax_bar, list(LABELS.values())[i]])
-
-    # Set figure title, add legend and save an image.
-    axes[-1][-1].set_axis_off()
-    if legend:
-        axes[-1][-1].legend(array(legend, dtype='object')[:, 0], array(legend, dtype='object')[:, 1],
-                            framealpha=0.5, loc="lower right",
-                            bbox_transform=plt.gcf().transFigure)
-
-    fig.suptitle(fig_title, fontsize=14, fontweight='bold')
-
-    image = BytesIO()
-    fig.savefig(image, bbox_inches='tight', format='png', dpi=70)
-    plt.close()
-
-    return image
-
-if __name__ == '__main__':
-    pass
+import csv
+from io import BytesIO
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from numpy import array, bincount, concatenate, digitize, intp, zeros
+from matplotlib.ticker import AutoLocator, MaxNLocator, ScalarFormatter
+from numpy import inf
+from constants import LABELS, COLORS
+
+# Bins edges [hours] and tick labels of occurrence curve.
+BINS = [0, 1, 4, 10, 34, 120, inf]
+TICKLABELS = ['<1 hour', '1/2 day', '1 day',
+              '2 days', '1 week', '>1 week']
+
+def _bin_index(hours):
+    """
+    Finds bin of each duration the same way as numpy.histogram
+    with BINS: the last bin includes its right edge.
+
+    Args:
+        hours (np.array): durations [hours];
+
+    Return:
+        index (np.array): int array, bin index, -1 for durations out of BINS.
+    """
+
+    index = digitize(hours, BINS) - 1
+    index[hours == BINS[-1]] = len(BINS) - 2
+    index[index >= len(BINS) - 1] = -1
+
+    return index
+
+def occurrence_counts(arrays, issues, labels):
+    """
+    Calculates occurrence curve data of all issues (tools) at once:
+    number of intervals of each label in each bin of BINS.
+    Durations of all tools are put into one array, their bins are
+    found by np.digitize and counted by a single np.bincount.
+
+    Args:
+        arrays (dict): see timetable.timetable_arrays;
+        issues (dict): dict with project issues: (issue_iid, issue_title);
+        labels (dict): dict with project labels: (label_id, label_name);
+
+    Return:
+        counts (np.array): int array (issues, labels, bins), issues without
+                           arrays have zero counts.
+    """
+
+    n_labels, n_bins = len(labels), len(BINS) - 1
+    row = {iid: i for i, iid in enumerate(issues.keys())}
+    tools = [iid for iid in arrays.keys() if iid in row]
+
+    # Hours are calculated as in timetable.timetable_rows.
+    hours = concatenate([arrays[iid]['seconds']/60.0/60.0 for iid in tools] or [zeros(0)])
+    cells = concatenate([arrays[iid]['label'] + row[iid]*n_labels for iid in tools]
+                        or [zeros(0, dtype=intp)])
+
+    index = _bin_index(hours)
+    valid = index >= 0
+    counts = bincount(cells[valid]*n_bins + index[valid], minlength=len(row)*n_labels*n_bins)
+
+    return counts.reshape(len(row), n_labels, n_bins)
+
+def write_occurrence_csv(path, counts, issues, labels):
+    """
+    Writes occurrence curve data table: one row per tool and label
+    with number of intervals in each bin, plus 'All tools' rows
+    with the sum of all tools.
+
+    Args:
+        path (Path object): path to .csv file;
+        counts (np.array): see occurrence_counts;
+        issues (dict): dict with project issues: (issue_iid, issue_title);
+        labels (dict): dict with project labels: (label_id, label_name).
+    """
+
+    with open(path, 'w', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(['tool', 'label'] + TICKLABELS + ['total'])
+
+        rows = list(zip(issues.values(), counts.tolist()))
+        rows.append(('All tools', counts.sum(axis=0).tolist()))
+
+        for title, tool_counts in rows:
+            for label_name, label_counts in zip(labels.values(), tool_counts):
+                writer.writerow([title, label_name] + label_counts + [sum(label_counts)])
+
+def occurrence_chart(counts, fig_title):
+    """
+    Creates occurrence curve (for all labels) for particular issue
+    from precomputed counts (see occurrence_counts).
+    x axis: time edges, ['<1 hour', '1/2 day', '1 day',
+                         '2 days', '1 week', '>1 week']
+    y_axis: amount of issue (tool) occurrences in time edges.
+    Labels without intervals have empty subplots. Only intervals within BINS
+    are counted, so a label with negative durations only (which paired
+    intervals do not have) gets an empty subplot, not zero bars.
+
+    Args:
+        counts (list or np.array): number of intervals (labels, bins);
+        fig_title (str): occurrence curve title;
+
+    Return:
+        image (io.BytesIO obj): BytesIO obj with occurrence curve.
+    """
+
+    counts = [hist if hist.sum() > 0 else None for hist in array(counts)]
+
+    # Update occurrence curve template with the data and render it.
+    template = _occurrence_template()
+    axes = template['axes']
+    names = list(LABELS.values())
+
+    legend = []
+    for i, hist in enumerate(counts):
+        bars, texts = template['bars'][i], template['texts'][i]
+        visible = hist is not None
+
+        # Labels without data have empty subplots.
+        for bar, text, y_coord in zip(bars, texts, hist if visible else [0]*len(bars)):
+            bar.set_height(y_coord)
+            bar.set_visible(visible)
+
+            # Add numbers to bar plot.
+            text.set_y(y_coord)
+            text.set_text(str(y_coord))
+            text.set_visible(visible and y_coord > 0)
+
+        # Empty subplot keeps default axis (ticks and limits) as without bars.
+        if visible:
+            axes[i].set_xticks(range(len(TICKLABELS)), TICKLABELS)
+            axes[i].set_autoscale_on(True)
+            axes[i].relim()
+            axes[i].autoscale_view()
+            legend.append([bars, names[i]])
+        else:
+            axes[i].xaxis.set_major_locator(AutoLocator())
+            axes[i].xaxis.set_major_formatter(ScalarFormatter())
+            axes[i].set_xlim(0., 1.)
+            axes[i].set_ylim(0., 1.)
+
+    # Set figure title, add legend and save an image.
+    if legend:
+        template['legend_axis'].legend(array(legend, dtype='object')[:, 0],
+                                       array(legend, dtype='object')[:, 1],
+                                       framealpha=0.5, loc="lower right",
+                                       bbox_transform=template['figure'].transFigure)
+    elif template['legend_axis'].get_legend():
+        template['legend_axis'].get_legend().remove()
+
+    template['figure'].suptitle(fig_title, fontsize=14, fontweight='bold')
+
+    image = BytesIO()
+    template['canvas'].print_figure(image, bbox_inches='tight', format='png', dpi=70)
+
+    return image
+
+# Occurrence curve template of this process.
+_template = {}
+
+def _occurrence_template():
+    """
+    Creates occurrence curve figure once per process: subplot for each label
+    with bars, bar numbers and tick labels, charts only change bar heights,
+    numbers, legend and title.
+
+    Return:
+        template (dict): 'figure', 'canvas', 'axes' (of labels), 'legend_axis',
+                         'bars' and 'texts' (for each label).
+    """
+
+    if not _template:
+        # Create occurrence curve plot.
+        fig_width, fig_height = 16., 9.
+        nrows, ncols = 3, 3
+        fig = Figure(figsize=(fig_width, fig_height))
+        canvas = FigureCanvasAgg(fig)
+        axes = fig.subplots(nrows=nrows, ncols=ncols).flatten()
+
+        color = [COLORS[val] for val in LABELS.values()]
+        bars, texts = [], []
+
+        for i, label_name in enumerate(LABELS.values()):
+
+            # Customize subplots: set title, grid and etc.
+            axes[i].yaxis.set_major_locator(MaxNLocator(integer=True))
+
+            # Create barplot for each label.
+            bars.append(axes[i].bar(range(len(TICKLABELS)), [0]*len(TICKLABELS),
+                                    width=0.8, align='center',
+                                    label=label_name,
+                                    color=color[i], tick_label=TICKLABELS))
+            texts.append([axes[i].text(x_coord, 0, '', color='black', fontsize=8)
+                          for x_coord in range(len(TICKLABELS))])
+
+        axes[-1].set_axis_off()
+
+        _template.update(figure=fig, canvas=canvas, axes=axes[:len(LABELS)],
+                         legend_axis=axes[-1], bars=bars, texts=texts)
+
+    return _template
+
+if __name__ == '__main__':
+    pass
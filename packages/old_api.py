@@ -1,117 +1,186 @@
-import sys
-import copy
-from pathlib import Path
-from re import search
-sys.path.append(str(Path(__file__).parent))
-
-from get_url import get_multipage_url
-from json_handler import load_json, save_to_json
-from constants import PROJ_URL, LABELS, LABEL_ADD, LABEL_REMOVE
-
-def filter_data(response):
-    """Trim any excess data from raw Gitlab API response. 
-
-    Args:
-        response (dictionary): Raw Gitlab API response
-
-    Returns:
-        (dictionary): filtered tool history
-        Unit example:
-        "<issue_id>":{
-            "<message_id>":{
-                "date"  : "created_at",
-                "action": "added / removed",
-                "label" : "",
-                "user"  : "author['name']"
-            }
-        }
-    """
-    formatted_history = {}
-    for message in response:
-        try:
-            adds = LABEL_ADD.search(message['body'])
-            removes = LABEL_REMOVE.search(message['body'])
-
-            removes = [] if removes is None else removes[0].strip().split(' ')
-            adds = [] if adds is None else adds[0].strip().split(' ')
-
-            id_increment = 1 / ( len(adds) + len(removes) )
-            message_id = int(message['id'])
-
-            for add in adds:
-                add = add.replace('~','')
-                formatted_history[message_id] =\
-                    {
-                        'date': message['created_at'],
-                        'label': LABELS[add],
-                        'user': message['author']['name'],
-                        'action': 'add'
-                    }
-                message_id += id_increment
-
-            for remove in removes:
-                remove = remove.replace('~','')
-                formatted_history[message_id] =\
-                    {
-                        'date': message['created_at'],
-                        'label': LABELS[remove],
-                        'user': message['author']['name'],
-                        'action': 'remove'
-                    }
-                message_id += id_increment
-        except:
-            # Ignore lables, which are not related to tool statuses
-            continue
-    return formatted_history
-
-
-def download_old_history(issue, url=PROJ_URL):
-    """
-    Downloads history of issue labels change by old Gitlab API (before 11.3 version).
-    Then the history is transformed into new Gitlab API label history format.
-
-    Args:
-        issue_id (int): id of issue in question;
-        labels (dict): dict with project issues: (label_id, label_name);
-        colors (dict): dict with label colors, (key, value) = (label_id, color);
-        url (string, default=PROJ_URL): project url;
-
-    Return:
-        history (dict): dict with (key, value) = (issue_iid, list with history of labels change);
-        history:
-        {
-            "<issue_id>":{
-			    "<message_id>":{
-                "date"  : "created_at",
-                "action": "added / removed",
-                "label" : "",
-                "user"  : "author['name']"
-			    }
-		    },
-            "Old ID offset": <max integer ID>
-        }
-    """
-
-    issue_id = issue[0]
-    issue_name = issue[1]
-    json_file = Path(fr'./history/{issue_name}.json').resolve()
-
-    if not json_file.exists():
-
-        full_url = f'{url}/issues/{issue_id}/notes'  # old full_url to issues history
-
-        raw_issue_history, _ = get_multipage_url(full_url)
-
-        # Remove extra lines from raw_issue_history,
-        # which do not contain label changes (such as comments)
-        issue_history = filter_data(raw_issue_history)
-
-        issue_history = {issue_id: issue_history}
-        issue_history['ID offset'] = int(max(issue_history[issue_id].keys())) if issue_history[issue_id] else 0
-    else:
-        issue_history = load_json(json_file)
-    return issue_history, issue
-
-
-if __name__ == '__main__':
-    pass
+import sys
+import copy
+from pathlib import Path
+from re import search
+from urllib.parse import urlencode
+sys.path.append(str(Path(__file__).parent))
+
+from get_url import get_multipage_url
+from datetimes import parse_dt
+from history_store import append_history, load_history
+from constants import PROJ_URL, LABELS, LABEL_ADD, LABEL_REMOVE
+
+def filter_data(response):
+    """Trim any excess data from raw Gitlab API response. 
+
+    Args:
+        response (dictionary): Raw Gitlab API response
+
+    Returns:
+        (dictionary): filtered tool history
+        Unit example:
+        "<issue_id>":{
+            "<message_id>":{
+                "ts"    : created_at [us since epoch],
+                "action": "added / removed",
+                "label" : "",
+                "user"  : "author['name']"
+            }
+        }
+    """
+    formatted_history = {}
+    for message in response:
+        try:
+            adds = LABEL_ADD.search(message['body'])
+            removes = LABEL_REMOVE.search(message['body'])
+
+            removes = [] if removes is None else removes[0].strip().split(' ')
+            adds = [] if adds is None else adds[0].strip().split(' ')
+
+            id_increment = 1 / ( len(adds) + len(removes) )
+            message_id = int(message['id'])
+            created_at = parse_dt(message['created_at'])
+
+            for add in adds:
+                add = add.replace('~','')
+                formatted_history[message_id] =\
+                    {
+                        'ts': created_at,
+                        'label': LABELS[add],
+                        'user': message['author']['name'],
+                        'action': 'add'
+                    }
+                message_id += id_increment
+
+            for remove in removes:
+                remove = remove.replace('~','')
+                formatted_history[message_id] =\
+                    {
+                        'ts': created_at,
+                        'label': LABELS[remove],
+                        'user': message['author']['name'],
+                        'action': 'remove'
+                    }
+                message_id += id_increment
+        except:
+            # Ignore lables, which are not related to tool statuses
+            continue
+    return formatted_history
+
+
+def download_old_history(issue, url=PROJ_URL):
+    """
+    Downloads history of issue labels change by old Gitlab API (before 11.3 version).
+    Then the history is transformed into new Gitlab API label history format.
+    If the tool history is saved (see history_store.py), only notes updated
+    after the stored 'Old API cursor' are requested and appended to it.
+
+    Args:
+        issue_id (int): id of issue in question;
+        labels (dict): dict with project issues: (label_id, label_name);
+        colors (dict): dict with label colors, (key, value) = (label_id, color);
+        url (string, default=PROJ_URL): project url;
+
+    Return:
+        history (dict): dict with (key, value) = (issue_iid, list with history of labels change);
+        history:
+        {
+            "<issue_id>":{
+			    "<message_id>":{
+                "ts"    : created_at [us since epoch],
+                "action": "added / removed",
+                "label" : "",
+                "user"  : "author['name']"
+			    }
+		    },
+            "ID offset": <max integer ID>,
+            "Old API cursor": {"updated_at": <last note updated_at>, "id": <last note id>}
+        }
+    """
+
+    issue_id = issue[0]
+    issue_name = issue[1]
+
+    cached_history = load_history(issue_name, issue_id)
+
+    raw_issue_history, _ = get_multipage_url(notes_url(url, issue_id, cached_history))
+
+    issue_history = merge_old_history(issue, raw_issue_history, cached_history)
+
+    return issue_history, issue
+
+def notes_url(url, issue_id, issue_history=None):
+    """
+    Makes url of issue notes sorted by update time.
+    For already saved history only notes updated after
+    its 'Old API cursor' are requested.
+
+    Args:
+        url (string): project url;
+        issue_id (int): id of issue in question;
+        issue_history (dict, default=None): saved history;
+
+    Return:
+        full_url (str): url of /notes with query.
+    """
+
+    query = {'sort': 'asc', 'order_by': 'updated_at'}
+
+    cursor = issue_history.get('Old API cursor') if issue_history else None
+
+    # Timestamp may have '+hh:mm' offset, so it is url encoded.
+    if cursor:
+        query['updated_after'] = cursor['updated_at']
+
+    return f'{url}/issues/{issue_id}/notes?{urlencode(query)}'
+
+def merge_old_history(issue, raw_issue_history, issue_history=None):
+    """
+    Builds issue history (see download_old_history) from raw /notes response
+    or merges the response into already saved issue_history.
+    New notes and cursors are appended to the history store.
+    'ID offset' is never changed for saved history, because
+    new API message ids are already shifted by it.
+
+    Args:
+        issue (tuple): (issue_iid, issue_title);
+        raw_issue_history (list): JSON decoded /notes pages;
+        issue_history (dict, default=None): saved history;
+
+    Return:
+        issue_history (dict): history with 'ID offset' and 'Old API cursor'.
+    """
+
+    issue_id = issue[0]
+    issue_name = issue[1]
+
+    # Remove extra lines from raw_issue_history,
+    # which do not contain label changes (such as comments)
+    notes = filter_data(raw_issue_history)
+
+    if issue_history is None:
+        issue_history = {issue_id: {}}
+        issue_history['ID offset'] = int(max(notes.keys())) if notes else 0
+
+    # Saved message ids are strings, repeated notes are merged by them.
+    # Ids above 'ID offset' are taken by new API events, keep such notes apart.
+    id_offset = int(issue_history['ID offset'])
+    # Extra labels of one note have fractional ids (see filter_data), the note id decides.
+    notes = {(str(key) if int(key) <= id_offset else f'note {key}'): value
+             for key, value in notes.items()}
+    notes = {key: value for key, value in notes.items() if key not in issue_history[issue_id]}
+    issue_history[issue_id].update(notes)
+
+    cursor = issue_history.get('Old API cursor')
+    last = max(((note['updated_at'], note['id']) for note in raw_issue_history
+                if 'updated_at' in note), default=None)
+
+    if last and (not cursor or last > (cursor['updated_at'], cursor['id'])):
+        issue_history['Old API cursor'] = {'updated_at': last[0], 'id': last[1]}
+
+    append_history(issue_name, notes, issue_history)
+
+    return issue_history
+
+if __name__ == '__main__':
+    pass
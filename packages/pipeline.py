@@ -0,0 +1,121 @@
+import sys
+import concurrent.futures
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+from datetimes import to_epoch
+from new_api import download_history, pair_events
+from old_api import download_old_history
+from timetable import arrays_summary, timetable_arrays
+
+def download_stream(issues):
+    """
+    Generator of downloaded histories: old history (old Gitlab API) of
+    each issue (tool) is downloaded and merged with new history (new Gitlab API),
+    the tool is yielded as soon as both parts are ready.
+
+    Args:
+        issues (dict): dict with project issues: (issue_iid, issue_title);
+
+    Return:
+        downloads (generator): (issue_id, events) tuples, see new_api.download_history.
+    """
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(issues)//2 + 1) as executor:
+        old = {executor.submit(download_old_history, issue) for issue in issues.items()}
+        pending = set(old)
+
+        # Futures are dropped when done, so only histories not yet analysed are kept.
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED)
+
+            for future in done:
+                if future in old:
+                    old.remove(future)
+                    old_history, issue = future.result()
+                    pending.add(executor.submit(download_history, old_history, issue))
+                else:
+                    yield from future.result().items()
+
+def clip_intervals(intervals, start_ts, end_ts):
+    """
+    Generator of intervals clipped to [start_ts, end_ts], intervals
+    outside the window are skipped.
+
+    Args:
+        intervals (iterable): {'id', 'added', 'removed'} dicts;
+        start_ts (int): window start timestamp;
+        end_ts (int): window end timestamp;
+
+    Return:
+        intervals (generator): clipped copies of intervals.
+    """
+
+    for entry in intervals:
+        if entry['added'] < end_ts and entry['removed'] > start_ts:
+            yield dict(entry,
+                       added=max(entry['added'], start_ts),
+                       removed=min(entry['removed'], end_ts))
+
+def analyze_tool(iid, events, labels, start_ts, end_ts, calendar=None, on_intervals=None):
+    """
+    Runs history of one issue (tool) through all stages:
+    pairing of events into intervals, clipping, durations and summary.
+
+    Args:
+        iid (int): issue id;
+        events (iterable): downloaded events of the issue;
+        labels (dict): dict with project labels: (label_id, label_name);
+        start_ts (int): start timestamp;
+        end_ts (int): end timestamp;
+        calendar (WorkCalendar, default=None): working calendar, full time if None;
+        on_intervals (callable, default=None): called with (iid, intervals)
+                                               before clipping, e.g. to build a cube;
+
+    Return:
+        result (dict): 'history' (clipped intervals), 'arrays'
+                       (see timetable.timetable_arrays) and 'summary' of the tool.
+    """
+
+    intervals = pair_events(events)
+
+    if on_intervals:
+        intervals = list(intervals)
+        on_intervals(iid, intervals)
+
+    history = {iid: list(clip_intervals(intervals, start_ts, end_ts))}
+    arrays = timetable_arrays(history, labels, calendar)
+
+    return {
+        'history': history[iid],
+        'arrays': arrays[iid],
+        'summary': arrays_summary(arrays, {iid: None}, labels)[iid]
+    }
+
+def stream_analysis(downloads, labels, start_dt, end_dt, calendar=None, on_intervals=None):
+    """
+    Generator of analysed tools: each tool is analysed as soon as
+    its download is complete, so only one tool's raw history is kept.
+
+    Args:
+        downloads (iterable): (issue_id, events) tuples, see download_stream;
+        labels (dict): dict with project labels: (label_id, label_name);
+        start_dt (datetime obj): start datetime;
+        end_dt (datetime obj): end datetime;
+        calendar (WorkCalendar, default=None): see analyze_tool;
+        on_intervals (callable, default=None): see analyze_tool;
+
+    Return:
+        results (generator): (issue_id, result) tuples, see analyze_tool.
+    """
+
+    start_ts = to_epoch(start_dt)
+    end_ts = to_epoch(end_dt)
+
+    for iid, events in downloads:
+        yield iid, analyze_tool(iid, events, labels, start_ts, end_ts, calendar, on_intervals)
+
+if __name__ == '__main__':
+    pass
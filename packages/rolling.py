@@ -0,0 +1,227 @@
+import sys
+import csv
+from datetime import timedelta
+from pathlib import Path
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent))
+
+from datetimes import US_PER_DAY, format_dt, to_epoch
+from intervals import IntervalIndex
+from timetable import timetable_arrays
+from transitions import TransitionStats
+from .indexes import INDEX_NAMES, calculate_indexes, verify_indexes
+
+def make_windows(start_dt, end_dt, days, step=None):
+    """
+    Splits [start_dt, end_dt] into windows of 'days' length, started
+    every 'step' days (rolling windows if step < days). The last window
+    is cut at end_dt.
+
+    Args:
+        start_dt (datetime obj): start datetime;
+        end_dt (datetime obj): end datetime;
+        days (int): window length [days];
+        step (int, default=None): distance between window starts [days],
+                                  equal to 'days' if None;
+
+    Return:
+        windows (list): list of (start, end) datetime tuples.
+    """
+
+    if step is None:
+        step = days
+
+    if days <= 0 or step <= 0:
+        raise ValueError(f'Window length and step must be positive: {days}, {step} days')
+
+    length = timedelta(days=days)
+    step = timedelta(days=step)
+    windows = []
+
+    start = start_dt
+    while start < end_dt:
+        windows.append((start, min(start + length, end_dt)))
+        start += step
+
+    return windows
+
+class LabelPrefixSums:
+    """
+    Covered time of each label of each issue (tool) as a function of time:
+    F(t) = sum of (t - added) over intervals added before t
+         - sum of (t - removed) over intervals removed before t.
+    Time of the label in [start, end] is F(end) - F(start), so with sorted
+    'added' / 'removed' arrays and their prefix sums any window takes
+    two binary searches per label, whatever the window length is.
+    With a working calendar the same is done on the axis of working time
+    (see datetimes.WorkCalendar.working_time), which keeps the order of timestamps.
+    """
+
+    def __init__(self, arrays, labels, calendar=None):
+
+        self.label_ids = list(labels.keys())
+        self.calendar = calendar
+        self.tools = {}
+
+        for iid, data in arrays.items():
+            start, end = self._axis(data['start']), self._axis(data['end'])
+
+            # Timestamps are taken from the earliest one to keep sums small.
+            base = int(start.min()) if len(start) else 0
+            tool = []
+
+            for label in range(len(self.label_ids)):
+                selected = data['label'] == label
+                starts = np.sort(start[selected] - base).astype(float)
+                ends = np.sort(end[selected] - base).astype(float)
+
+                tool.append((starts, np.concatenate(([0.], np.cumsum(starts))),
+                             ends, np.concatenate(([0.], np.cumsum(ends)))))
+
+            self.tools[iid] = (base, tool)
+
+    def _axis(self, ts):
+        """
+        Maps timestamps to working time, if calendar is set.
+
+        Args:
+            self: the instance of the class;
+            ts (np.array): int64 timestamps.
+        """
+
+        return self.calendar.working_time(ts) if self.calendar else np.asarray(ts)
+
+    def covered(self, iid, ts):
+        """
+        Calculates covered time of each label up to each timestamp in ts.
+
+        Args:
+            self: the instance of the class;
+            iid (int): issue id;
+            ts (np.array): int64 timestamps (see datetimes.to_epoch);
+
+        Return:
+            covered (np.array): float array (labels, len(ts)) [us].
+        """
+
+        base, tool = self.tools[iid]
+        ts = (self._axis(ts) - base).astype(float)
+        covered = np.zeros((len(tool), len(ts)))
+
+        for label, (starts, starts_sum, ends, ends_sum) in enumerate(tool):
+            i = np.searchsorted(starts, ts, side='left')
+            j = np.searchsorted(ends, ts, side='left')
+            covered[label] = i*ts - starts_sum[i] - (j*ts - ends_sum[j])
+
+        return covered
+
+    def summaries(self, windows, issues):
+        """
+        Calculates summary time of each label for each window.
+
+        Args:
+            self: the instance of the class;
+            windows (list): list of (start, end) datetime tuples;
+            issues (dict): dict with project issues: (issue_iid, issue_title);
+
+        Return:
+            summaries (list): summary (see timetable.arrays_summary) for each window.
+        """
+
+        bounds = np.array([[to_epoch(start), to_epoch(end)] for start, end in windows],
+                          dtype=np.int64).reshape(len(windows), 2)
+        summaries = [{iid: dict.fromkeys(self.label_ids, 0.) for iid in issues}
+                     for _ in windows]
+
+        for iid in issues:
+            if iid not in self.tools:
+                continue
+
+            days = (self.covered(iid, bounds[:, 1]) - self.covered(iid, bounds[:, 0])) / US_PER_DAY
+
+            for summary, window_days in zip(summaries, days.T.tolist()):
+                summary[iid] = dict(zip(self.label_ids, window_days))
+
+        return summaries
+
+def rolling_report(history, issues, labels, windows, specs, calendar=None):
+    """
+    Calculates summary, production indexes and their verification
+    for each window from one history (see timetable.timetable_arrays).
+
+    Args:
+        history (dict): label changes history for each issue;
+        issues (dict): dict with project issues: (issue_iid, issue_title);
+        labels (dict): dict with project labels: (label_id, label_name);
+        windows (list): list of (start, end) datetime tuples;
+        specs (dict): specs for production indexes (see indexes.verify_indexes);
+        calendar (WorkCalendar, default=None): working calendar, full time if None;
+
+    Return:
+        report (list): for each window dict with 'start', 'end', 'summary',
+                       'indexes', 'avg_indexes' and 'verification'.
+    """
+
+    index = IntervalIndex(history, labels)
+    prefix_sums = LabelPrefixSums(timetable_arrays(history, labels), labels, calendar)
+    report = []
+
+    for (start, end), summary in zip(windows, prefix_sums.summaries(windows, issues)):
+        # Label changes depend on the order of clipped intervals, not only on sums.
+        arrays = index.window_arrays(to_epoch(start), to_epoch(end), calendar)
+        transitions = TransitionStats.from_arrays(arrays, labels)
+
+        # Only tools of 'arrays' are used, as for history.
+        indexes, avg_indexes = calculate_indexes(summary, arrays, labels, transitions)
+
+        report.append({
+            'start': start,
+            'end': end,
+            'summary': summary,
+            'indexes': indexes,
+            'avg_indexes': avg_indexes,
+            'verification': (verify_indexes(indexes, specs, True),
+                             verify_indexes(avg_indexes, specs, False))
+        })
+
+    return report
+
+def write_rolling_csv(path, report, issues, labels):
+    """
+    Writes rolling report as a time series: one row per window and tool
+    with label times [days], production indexes and indexes out of specs,
+    plus 'Average' row of each window.
+
+    Args:
+        path (Path object): path to .csv file;
+        report (list): see rolling_report;
+        issues (dict): dict with project issues: (issue_iid, issue_title);
+        labels (dict): dict with project labels: (label_id, label_name).
+    """
+
+    with open(path, 'w', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(['start', 'end', 'tool'] + list(labels.values())
+                        + list(INDEX_NAMES) + ['out of spec'])
+
+        for window in report:
+            start = format_dt(to_epoch(window['start']))
+            end = format_dt(to_epoch(window['end']))
+            verification, avg_verification = window['verification']
+
+            for iid, title in issues.items():
+                if iid not in window['indexes']:
+                    continue
+
+                writer.writerow([start, end, title]
+                                + [window['summary'][iid][label_id] for label_id in labels]
+                                + [window['indexes'][iid][name] for name in INDEX_NAMES]
+                                + [' '.join(name for name, ok in verification[iid].items() if not ok)])
+
+            writer.writerow([start, end, 'Average'] + [''] * len(labels)
+                            + [window['avg_indexes'][name] for name in INDEX_NAMES]
+                            + [' '.join(name for name, ok in avg_verification.items() if not ok)])
+
+if __name__ == '__main__':
+    pass
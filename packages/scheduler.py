@@ -0,0 +1,281 @@
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from requests.exceptions import ConnectionError, Timeout
+
+# Responses which are worth to be repeated.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 6
+BACKOFF_BASE = 0.5  # [s]
+BACKOFF_MAX = 60.   # [s]
+
+# Concurrency limits of the requests to Gitlab.
+MAX_CONCURRENCY = 32
+MIN_CONCURRENCY = 2
+
+# Slow down, when less requests than this are left in rate limit window.
+MIN_RATELIMIT_REMAINING = 10
+
+def retry_delay(attempt):
+    """
+    Calculates delay before the next attempt: jittered exponential
+    backoff ("full jitter"). Server defined delay ('Retry-After')
+    is found by throttle_delay.
+
+    Args:
+        attempt (int): number of the failed attempt, starting from 0;
+
+    Return:
+        delay (float): delay in seconds.
+    """
+
+    return random.uniform(0., min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+def throttle_delay(headers):
+    """
+    Finds how long all requests have to wait according to
+    'Retry-After' or 'RateLimit-Remaining' / 'RateLimit-Reset' headers.
+
+    Args:
+        headers (dict-like): case-insensitive response headers;
+
+    Return:
+        delay (float): delay in seconds, 0. if requests can go on.
+    """
+
+    retry_after = headers.get('Retry-After')
+
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_MAX)
+
+        except ValueError:
+            try:
+                reset = parsedate_to_datetime(retry_after).timestamp()
+                return min(max(reset - time.time(), 0.), BACKOFF_MAX)
+
+            except (TypeError, ValueError):
+                return 0.
+
+    remaining = headers.get('RateLimit-Remaining')
+    reset = headers.get('RateLimit-Reset')
+
+    try:
+        if remaining is not None and reset and int(remaining) < MIN_RATELIMIT_REMAINING:
+            return min(max(float(reset) - time.time(), 0.), BACKOFF_MAX)
+
+    except ValueError:
+        pass
+
+    return 0.
+
+def is_pushback(headers):
+    """
+    Checks whether the server asks to slow down.
+
+    Args:
+        headers (dict-like): case-insensitive response headers;
+    """
+
+    remaining = headers.get('RateLimit-Remaining')
+
+    try:
+        return remaining is not None and int(remaining) < MIN_RATELIMIT_REMAINING
+
+    except ValueError:
+        return False
+
+class AdaptiveLimit:
+    """
+    Concurrency limit for threads, which is halved when the server
+    pushes back and grows by one after 'window' successful requests.
+    Used as a context manager around a single request.
+    """
+
+    def __init__(self,
+                 limit=MAX_CONCURRENCY, minimum=MIN_CONCURRENCY, window=20):
+
+        self.maximum = limit
+        self.minimum = minimum
+        self.limit = limit
+        self.window = window
+        self.active = 0
+        self.successes = 0
+        self.condition = threading.Condition()
+
+    def __enter__(self):
+
+        with self.condition:
+            while self.active >= self.limit:
+                self.condition.wait()
+            self.active += 1
+
+        return self
+
+    def __exit__(self, *args):
+
+        with self.condition:
+            self.active -= 1
+            self.condition.notify()
+
+    def shrink(self):
+        """
+        Halves the limit (multiplicative decrease).
+
+        Args:
+            self: the instance of the class.
+        """
+
+        with self.condition:
+            self.limit = max(self.minimum, self.limit // 2)
+            self.successes = 0
+
+    def grow(self):
+        """
+        Increases the limit by one every 'window' calls (additive increase).
+
+        Args:
+            self: the instance of the class.
+        """
+
+        with self.condition:
+            self.successes += 1
+
+            if self.successes >= self.window and self.limit < self.maximum:
+                self.limit += 1
+                self.successes = 0
+                self.condition.notify()
+
+class RequestScheduler:
+    """
+    Runs requests through AdaptiveLimit, retries failed ones with
+    backoff, pauses all threads when the server asks to wait and
+    counts requests, retries and throttling events.
+    """
+
+    def __init__(self,
+                 limit=MAX_CONCURRENCY, max_retries=MAX_RETRIES):
+
+        self.limit = AdaptiveLimit(limit)
+        self.max_retries = max_retries
+        self.resume_at = 0.
+        self.counters = {'requests': 0, 'retries': 0, 'throttled': 0, 'failed': 0}
+        self.lock = threading.Lock()
+
+    def count(self, name):
+        """
+        Increments counter 'name' by one.
+
+        Args:
+            self: the instance of the class;
+            name (str): 'requests', 'retries', 'throttled' or 'failed'.
+        """
+
+        with self.lock:
+            self.counters[name] += 1
+
+    def pause(self, delay):
+        """
+        Makes all requests wait at least 'delay' seconds from now.
+
+        Args:
+            self: the instance of the class;
+            delay (float): delay in seconds.
+        """
+
+        with self.lock:
+            self.resume_at = max(self.resume_at, time.monotonic() + delay)
+
+    def wait(self):
+        """
+        Waits till the end of the current pause.
+
+        Args:
+            self: the instance of the class.
+        """
+
+        delay = self.resume_at - time.monotonic()
+        if delay > 0.:
+            time.sleep(delay)
+
+    def request(self, send):
+        """
+        Sends a request, retrying connection errors and RETRY_STATUSES.
+
+        Args:
+            self: the instance of the class;
+            send (callable): function without args, which makes a request
+                             and returns requests.Response;
+
+        Return:
+            response (requests.Response): last received response.
+        """
+
+        for attempt in range(self.max_retries + 1):
+            self.wait()
+
+            try:
+                with self.limit:
+                    self.count('requests')
+                    response = send()
+
+            except (ConnectionError, Timeout):
+                if attempt == self.max_retries:
+                    self.count('failed')
+                    raise
+
+                self.count('retries')
+                time.sleep(retry_delay(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                self.count('retries')
+                if response.status_code == 429:
+                    self.count('throttled')
+                self.limit.shrink()
+
+                # Server defined delay holds all threads, backoff only this one.
+                delay = throttle_delay(response.headers)
+                if delay > 0.:
+                    self.pause(delay)
+                else:
+                    time.sleep(retry_delay(attempt))
+                continue
+
+            if is_pushback(response.headers):
+                self.count('throttled')
+                self.limit.shrink()
+                self.pause(throttle_delay(response.headers))
+            else:
+                self.limit.grow()
+
+            if response.status_code in RETRY_STATUSES:
+                self.count('failed')
+
+            return response
+
+    def stats(self):
+        """
+        Return:
+            stats (dict): counters and current concurrency limit.
+        """
+
+        with self.lock:
+            stats = dict(self.counters)
+
+        stats['limit'] = self.limit.limit
+
+        return stats
+
+_scheduler = RequestScheduler()
+
+def get_scheduler():
+    """
+    Returns the request scheduler shared by all download threads.
+    """
+
+    return _scheduler
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,146 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+# Number of per-host pools kept alive and connections kept in each pool.
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 32
+
+_session = None
+_session_lock = threading.Lock()
+_pool_settings = {'pool_connections': POOL_CONNECTIONS,
+                  'pool_maxsize': POOL_MAXSIZE}
+
+class CountingAdapter(HTTPAdapter):
+    """
+    HTTPAdapter, which keeps connection counters of the pools
+    evicted by its pool manager (one pool per host, at most
+    'pool_connections' of them), so session_stats does not lose them.
+    """
+
+    def __init__(self, *args, **kwargs):
+
+        self.retired = {'requests': 0, 'opened': 0}
+        self.retired_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pools.dispose_func = self._retire_pool
+
+    def _retire_pool(self, pool):
+        """
+        Adds counters of the evicted pool to the adapter counters and closes it.
+
+        Args:
+            self: the instance of the class;
+            pool (urllib3.HTTPConnectionPool): evicted pool.
+        """
+
+        with self.retired_lock:
+            self.retired['requests'] += pool.num_requests
+            self.retired['opened'] += pool.num_connections
+
+        pool.close()
+
+def configure_session(pool_connections=POOL_CONNECTIONS,
+                      pool_maxsize=POOL_MAXSIZE):
+    """
+    Sets connection pool size of the shared session.
+    Has to be called before the first request, otherwise
+    the current session is closed and recreated with new settings.
+
+    Args:
+        pool_connections (int): number of hosts to keep pools for;
+        pool_maxsize (int): max number of kept-alive connections per host.
+    """
+
+    global _session
+
+    with _session_lock:
+        _pool_settings['pool_connections'] = int(pool_connections)
+        _pool_settings['pool_maxsize'] = int(pool_maxsize)
+
+        if _session is not None:
+            _session.close()
+            _session = None
+
+def get_session():
+    """
+    Returns the shared requests.Session, creating it on first call.
+    The session keeps connections alive and reuses them between all
+    download threads, so every page request does not pay TCP+TLS handshake.
+
+    Return:
+        session (requests.Session): shared pooled session.
+    """
+
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # Block instead of opening extra connections, which
+                # would be thrown away after the request.
+                adapter = CountingAdapter(pool_block=True, **_pool_settings)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update({'Accept-Encoding': 'gzip, deflate',
+                                        'Connection': 'keep-alive'})
+                _session = session
+
+    return _session
+
+def session_stats():
+    """
+    Collects connection counters from all pools of the shared session,
+    including pools, which were already evicted (see CountingAdapter).
+
+    Return:
+        stats (dict): number of 'requests' made, connections 'opened'
+                      and 'reused' (requests served by already open connection).
+    """
+
+    stats = {'requests': 0, 'opened': 0, 'reused': 0}
+
+    if _session is None:
+        return stats
+
+    for adapter in set(_session.adapters.values()):
+        with adapter.retired_lock:
+            stats['requests'] += adapter.retired['requests']
+            stats['opened'] += adapter.retired['opened']
+
+        pools = adapter.poolmanager.pools
+
+        with pools.lock:
+            keys = list(pools.keys())
+
+        for key in keys:
+            pool = pools.get(key)
+            if pool is None:
+                continue
+
+            stats['requests'] += pool.num_requests
+            stats['opened'] += pool.num_connections
+
+    stats['reused'] = max(stats['requests'] - stats['opened'], 0)
+
+    return stats
+
+def close_session():
+    """
+    Closes all pooled connections of the shared session.
+    """
+
+    global _session
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+if __name__ == '__main__':
+    pass
@@ -1,111 +1,156 @@
-
-import sys
-from datetime import datetime
-from pathlib import Path
-
-sys.path.append(str(Path(__file__).parent))
-
-from datetimes import subtract_datetime
-from constants import DT_FORMAT
-
-def timetable_calculation(history):
-    """
-    Calculates time of each tool in status from history (history of tool status change)
-    within date and time borders: [start_dt, end_dt].
-
-    history:
-    {issue_id1: [
-        {'label': '',
-         'added': '2018-11-09T11:39:53.351Z',
-         'removed': '2018-11-10T12:24:53.001Z',
-        },
-        {...},
-        ...],
-     issue_id2: [
-        {...},
-        {...},
-        ...],
-     ...}
-
-    Args:
-        history (dict): dictionary with status (label) change for each tool (issue);
-        start_dt (datetime object): start date and time;
-        end_dt (datetime object): end date and time;
-
-    Return:
-        timetable (dict): dictionary with time (days/hours/minutes/seconds)
-                          of each label (status) for each issue (tool).
-    """
-
-    try:
-
-        timetable = {}
-
-        for iid, data in history.items():
-
-            tmp = []
-
-            for row in data:
-
-                added_dt = datetime.strptime(row['added'], DT_FORMAT)
-                removed_dt = datetime.strptime(row['removed'], DT_FORMAT)
-
-                days, hours, minutes, seconds = subtract_datetime(added_dt, removed_dt)
-
-                label_time =\
-                {
-                    'id'     : row['id'],
-                    'added'  : row['added'],
-                    'removed': row['removed'],
-                    'days'   : days,
-                    'hours'  : hours,
-                    'minutes': minutes,
-                    'seconds': seconds
-                }
-
-                tmp.append(label_time)
-
-            timetable[iid] = tmp
-
-        return timetable
-
-    except KeyError:
-        print("Error during labels time calculation.")
-        exit()
-
-def timetable_summary(timetable,
-                      issues,
-                      labels):
-    """
-    Function calculates the summary time
-    for each issue (tool) for each label (state).
-
-    Args:
-        timetable (dict): contains times of each issue and each label;
-        issues (dict): dict with project issues: (issue_iid, issue_title);
-        labels (dict): dict with project issues: (label_id, label_name);
-
-    Return:
-        summary (dict): dict with the summary time
-                        for each issue (tool) for each label (state).
-    """
-
-    summary = {}
-
-    for issue_iid in issues.keys():
-
-        tmp = \
-        {
-            label_iid : 0.0 for label_iid in labels.keys()
-        }
-        summary[issue_iid] = tmp
-
-    for iid, data in timetable.items():
-        for row in data:
-
-            summary[iid][row['id']] += row['days']
-
-    return summary
-
-if __name__ == '__main__':
-    pass
+
+import sys
+from pathlib import Path
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent))
+
+from datetimes import format_dt, US_PER_SECOND
+
+def timetable_arrays(history, labels, calendar=None):
+    """
+    Converts history into parallel arrays for each issue (tool):
+    label index (position of label id in labels), 'start' and 'end'
+    timestamps and 'seconds' duration of each interval.
+    If 'calendar' is set, only working time is calculated.
+
+    history:
+    {issue_id1: [
+        {'id': label_id,
+         'added': 1541763593351000,
+         'removed': 1541852693001000,
+        },
+        {...},
+        ...],
+     issue_id2: [
+        {...},
+        {...},
+        ...],
+     ...}
+
+    Args:
+        history (dict): dictionary with status (label) change for each tool (issue);
+        labels (dict): dict with project labels: (label_id, label_name);
+        calendar (WorkCalendar, default=None): working calendar (see datetimes.WorkCalendar),
+                                               full time if None;
+
+    Return:
+        arrays (dict): {issue_id: {'label': int array, 'start': int64 array,
+                                   'end': int64 array, 'seconds': float array}}.
+    """
+
+    label_index = {label_id: i for i, label_id in enumerate(labels.keys())}
+    arrays = {}
+
+    try:
+        for iid, data in history.items():
+
+            label = np.fromiter((label_index[row['id']] for row in data),
+                                dtype=np.intp, count=len(data))
+            start = np.fromiter((row['added'] for row in data),
+                                dtype=np.int64, count=len(data))
+            end = np.fromiter((row['removed'] for row in data),
+                              dtype=np.int64, count=len(data))
+
+            seconds = calendar.working_seconds(start, end) if calendar\
+                      else (end - start) / US_PER_SECOND
+
+            arrays[iid] = {'label': label, 'start': start, 'end': end, 'seconds': seconds}
+
+    except KeyError:
+        print("Error during labels time calculation.")
+        exit()
+
+    return arrays
+
+def timetable_rows(arrays, labels):
+    """
+    Makes timetable, i.e. time of each label interval of each issue (tool),
+    from timetable_arrays.
+
+    Args:
+        arrays (dict): see timetable_arrays;
+        labels (dict): dict with project labels: (label_id, label_name);
+
+    Return:
+        timetable (dict): dictionary with time (days/hours/minutes/seconds)
+                          of each label (status) for each issue (tool).
+    """
+
+    label_ids = list(labels.keys())
+    timetable = {}
+
+    for iid, data in arrays.items():
+
+        seconds = data['seconds']
+        minutes = seconds/60.0
+        hours = minutes/60.0
+        days = hours/24.0
+
+        timetable[iid] = [
+            {
+                'id'     : label_ids[label],
+                'added'  : added,
+                'removed': removed,
+                'days'   : row_days,
+                'hours'  : row_hours,
+                'minutes': row_minutes,
+                'seconds': row_seconds
+            }
+            for label, added, removed, row_days, row_hours, row_minutes, row_seconds
+            in zip(data['label'].tolist(), data['start'].tolist(), data['end'].tolist(),
+                   days.tolist(), hours.tolist(), minutes.tolist(), seconds.tolist())]
+
+    return timetable
+
+def arrays_summary(arrays,
+                   issues,
+                   labels):
+    """
+    Calculates the summary time for each issue (tool) for each label (state):
+    sums days of each label for all issues (tools) with a single np.bincount.
+
+    Args:
+        arrays (dict): see timetable_arrays;
+        issues (dict): dict with project issues: (issue_iid, issue_title);
+        labels (dict): dict with project labels: (label_id, label_name);
+
+    Return:
+        summary (dict): dict with the summary time
+                        for each issue (tool) for each label (state).
+    """
+
+    label_ids = list(labels.keys())
+    issue_ids = list(issues.keys())
+    n_labels = len(label_ids)
+    row = {iid: i for i, iid in enumerate(issue_ids)}
+
+    tools = [iid for iid in arrays.keys() if iid in row]
+    bins = [arrays[iid]['label'] + row[iid]*n_labels for iid in tools]
+    days = [arrays[iid]['seconds'] / 86400. for iid in tools]
+
+    totals = np.bincount(np.concatenate(bins) if bins else np.zeros(0, dtype=np.intp),
+                         weights=np.concatenate(days) if days else np.zeros(0),
+                         minlength=len(issue_ids)*n_labels)
+    totals = totals.reshape(len(issue_ids), n_labels).tolist()
+
+    return {iid: dict(zip(label_ids, totals[i])) for i, iid in enumerate(issue_ids)}
+
+def format_timetable(timetable):
+    """
+    Makes a copy of timetable with 'added' and 'removed'
+    timestamps formatted as date strings, for output only.
+
+    Args:
+        timetable (dict): see timetable_rows;
+
+    Return:
+        timetable (dict): timetable with date strings.
+    """
+
+    return {iid: [dict(row, added=format_dt(row['added']), removed=format_dt(row['removed']))
+                  for row in data]
+            for iid, data in timetable.items()}
+
+if __name__ == '__main__':
+    pass
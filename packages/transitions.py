@@ -0,0 +1,203 @@
+import sys
+from pathlib import Path
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent))
+
+from timetable import timetable_arrays
+
+class TransitionStats:
+    """
+    Label to label transition statistics of all issues (tools),
+    calculated in a single pass over history (see timetable.timetable_arrays).
+    For each tool and each pair of labels (src, dst) it keeps the number
+    of changes src -> dst and the total time spent in src before the change,
+    so any transition question is a lookup in these matrices.
+
+    Attributes:
+        tools (list): issue ids in history order (first axis of matrices);
+        row (dict): {issue_id: position in tools};
+        label_ids (list): label ids (second and third axis of matrices);
+        counts (np.array): int array (tools, labels, labels), number of changes;
+        dwell (np.array): float array (tools, labels, labels), time in src [days].
+    """
+
+    def __init__(self, history, labels):
+
+        self._count(timetable_arrays(history, labels), labels)
+
+    @classmethod
+    def from_arrays(cls, arrays, labels):
+        """
+        Calculates statistics from history in the form of timetable.timetable_arrays.
+
+        Args:
+            cls: the class;
+            arrays (dict): see timetable.timetable_arrays;
+            labels (dict): dict with project labels: (label_id, label_name);
+
+        Return:
+            stats (TransitionStats): transition statistics.
+        """
+
+        stats = cls.__new__(cls)
+        stats._count(arrays, labels)
+
+        return stats
+
+    def _count(self, arrays, labels):
+        """
+        Fills count and dwell matrices with a single np.bincount each.
+
+        Args:
+            self: the instance of the class;
+            arrays (dict): see timetable.timetable_arrays;
+            labels (dict): dict with project labels: (label_id, label_name).
+        """
+
+        self.tools = list(arrays.keys())
+        self.row = {iid: i for i, iid in enumerate(self.tools)}
+        self.label_ids = list(labels.keys())
+        self.position = {name: i for i, name in enumerate(labels.values())}
+
+        size = len(self.label_ids)
+        codes, days = [], []
+
+        # Each tool is one sequence of label indexes, pairs are not taken across tools.
+        for row, data in enumerate(arrays.values()):
+            sequence = data['label']
+
+            codes.append(row*size*size + sequence[:-1]*size + sequence[1:])
+            days.append(data['seconds'][:-1] / 86400.)
+
+        codes = np.concatenate(codes) if codes else np.zeros(0, dtype=np.intp)
+        days = np.concatenate(days) if days else np.zeros(0)
+        shape = (len(self.tools), size, size)
+
+        self.counts = np.bincount(codes, minlength=np.prod(shape)).reshape(shape)
+        self.dwell = np.bincount(codes, weights=days, minlength=np.prod(shape)).reshape(shape)
+
+    def _positions(self, label_names):
+        """
+        Returns positions of labels in matrices.
+
+        Args:
+            self: the instance of the class;
+            label_names (str or list): label name or list of label names.
+        """
+
+        if isinstance(label_names, str):
+            label_names = [label_names]
+
+        return [self.position[name] for name in label_names]
+
+    def _select(self, matrix, iid):
+        """
+        Returns matrix of the tool 'iid' or fleet-wide sum if iid is None.
+
+        Args:
+            self: the instance of the class;
+            matrix (np.array): counts or dwell;
+            iid (int or None): issue id.
+        """
+
+        return matrix.sum(axis=0) if iid is None else matrix[self.row[iid]]
+
+    def changes(self, src_labels, dst_labels):
+        """
+        Counts changes from any of src_labels to any of dst_labels for each tool.
+
+        Args:
+            self: the instance of the class;
+            src_labels (str or list): source label names;
+            dst_labels (str or list): destination label names;
+
+        Return:
+            number (np.array): int array, number of changes for each tool.
+        """
+
+        src, dst = self._positions(src_labels), self._positions(dst_labels)
+
+        return self.counts[:, src][:, :, dst].sum(axis=(1, 2))
+
+    def count(self, src_labels, dst_labels, iid=None):
+        """
+        Counts changes from src_labels to dst_labels.
+
+        Args:
+            self: the instance of the class;
+            src_labels (str or list): source label names;
+            dst_labels (str or list): destination label names;
+            iid (int, default=None): issue id, None for all tools;
+
+        Return:
+            number (int): number of changes.
+        """
+
+        src, dst = self._positions(src_labels), self._positions(dst_labels)
+
+        return int(self._select(self.counts, iid)[np.ix_(src, dst)].sum())
+
+    def mean_dwell(self, src_labels, dst_labels, iid=None):
+        """
+        Finds mean time in src_labels before a change to dst_labels,
+        e.g. mean_dwell('Maintenance', 'Up') is mean time from Maintenance to Up.
+
+        Args:
+            self: the instance of the class;
+            src_labels (str or list): source label names;
+            dst_labels (str or list): destination label names;
+            iid (int, default=None): issue id, None for all tools;
+
+        Return:
+            days (float or None): mean time [days], None if there were no changes.
+        """
+
+        src, dst = self._positions(src_labels), self._positions(dst_labels)
+        number = self._select(self.counts, iid)[np.ix_(src, dst)].sum()
+        time = self._select(self.dwell, iid)[np.ix_(src, dst)].sum()
+
+        return float(time/number) if number > 0 else None
+
+    def count_matrix(self, iid=None):
+        """
+        Returns label x label matrix of change counts
+        (rows are sources, columns are destinations, in label_ids order).
+
+        Args:
+            self: the instance of the class;
+            iid (int, default=None): issue id, None for all tools.
+        """
+
+        return self._select(self.counts, iid)
+
+    def mean_dwell_matrix(self, iid=None):
+        """
+        Returns label x label matrix of mean time in source label
+        before the change [days], NaN where there were no changes.
+
+        Args:
+            self: the instance of the class;
+            iid (int, default=None): issue id, None for all tools.
+        """
+
+        counts = self._select(self.counts, iid)
+        dwell = self._select(self.dwell, iid)
+
+        return np.divide(dwell, counts, out=np.full(counts.shape, np.nan), where=counts > 0)
+
+    def save(self, path):
+        """
+        Saves statistics of the run to .npz file.
+
+        Args:
+            self: the instance of the class;
+            path (Path object): path to .npz file.
+        """
+
+        np.savez_compressed(path, tools=np.array(self.tools, dtype=str),
+                            label_ids=np.array(self.label_ids, dtype=str),
+                            counts=self.counts, dwell=self.dwell)
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,256 @@
+import sys
+from pathlib import Path
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent))
+
+from datetimes import US_PER_DAY, US_PER_SECOND, to_epoch
+from history_store import HISTORY_FOLDER
+from timetable import timetable_arrays
+
+HOUR = 3600 * US_PER_SECOND
+CUBE_FOLDER = HISTORY_FOLDER / 'cube'
+
+class ToolCube:
+    """
+    Cumulative time of each label of one issue (tool) on the hour grid.
+    Covered time up to any timestamp is the cumulative time up to the
+    hour before it, plus the exact part of that hour, which is taken
+    from the label changes (events) of this hour only. So any range
+    is answered in constant time, whatever its length is.
+
+    Attributes:
+        origin (int): timestamp of the first hour of the grid;
+        buckets (np.array): int64 array (labels, hours), label time in each hour [us];
+        events (np.array): int64 timestamps of label changes, grouped by label, sorted;
+        signs (np.array): +1 for 'added', -1 for 'removed' events;
+        pointers (np.array): int array (labels, hours+1), index of the first event
+                             of each label at or after the start of each hour.
+    """
+
+    def __init__(self, origin, buckets, events, signs, pointers):
+
+        self.origin = origin
+        self.buckets = buckets
+        self.events = events
+        self.signs = signs
+        self.pointers = pointers
+
+        # Cumulative label time at hour starts and number of open intervals there.
+        self.cumulative = np.concatenate((np.zeros((len(buckets), 1), dtype=np.int64),
+                                          np.cumsum(buckets, axis=1)), axis=1)
+        self.open = np.concatenate(([0], np.cumsum(signs)))[pointers]
+
+    @classmethod
+    def from_arrays(cls, data, n_labels):
+        """
+        Builds the cube from intervals of one tool.
+
+        Args:
+            cls: the class;
+            data (dict): intervals of the tool, see timetable.timetable_arrays;
+            n_labels (int): number of labels;
+
+        Return:
+            cube (ToolCube): cube of the tool.
+        """
+
+        origin = int(data['start'].min()) // HOUR * HOUR if len(data['start']) else 0
+        hours = -(-(int(data['end'].max()) - origin) // HOUR) if len(data['end']) else 0
+        grid = origin + np.arange(hours + 1, dtype=np.int64) * HOUR
+
+        buckets = np.zeros((n_labels, hours), dtype=np.int64)
+        pointers = np.zeros((n_labels, hours + 1), dtype=np.int64)
+        events, signs = [], []
+        offset = 0
+
+        for label in range(n_labels):
+            selected = data['label'] == label
+            starts = np.sort(data['start'][selected])
+            ends = np.sort(data['end'][selected])
+
+            # Covered time up to each hour start: sum of (t - added) - sum of (t - removed).
+            i = np.searchsorted(starts, grid, side='left')
+            j = np.searchsorted(ends, grid, side='left')
+            starts_sum = np.concatenate(([0], np.cumsum(starts - origin)))
+            ends_sum = np.concatenate(([0], np.cumsum(ends - origin)))
+            covered = i*(grid - origin) - starts_sum[i] - (j*(grid - origin) - ends_sum[j])
+            buckets[label] = np.diff(covered)
+
+            order = np.argsort(np.concatenate((starts, ends)), kind='stable')
+            label_events = np.concatenate((starts, ends))[order]
+            label_signs = np.concatenate((np.ones(len(starts), dtype=np.int64),
+                                          -np.ones(len(ends), dtype=np.int64)))[order]
+
+            pointers[label] = offset + np.searchsorted(label_events, grid, side='left')
+            events.append(label_events)
+            signs.append(label_signs)
+            offset += len(label_events)
+
+        return cls(origin, buckets,
+                   np.concatenate(events) if events else np.zeros(0, dtype=np.int64),
+                   np.concatenate(signs) if signs else np.zeros(0, dtype=np.int64),
+                   pointers)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads the cube from .npz file.
+
+        Args:
+            cls: the class;
+            path (Path object): path to .npz file;
+
+        Return:
+            cube (ToolCube or None): cube, None if there is no such file.
+        """
+
+        try:
+            with np.load(path) as data:
+                return cls(int(data['origin']), data['buckets'],
+                           data['events'], data['signs'], data['pointers'])
+
+        except OSError:
+            return None
+
+    def save(self, path):
+        """
+        Saves the cube to .npz file. Hour buckets and pointers are
+        mostly repeated values, so the file is compressed.
+
+        Args:
+            self: the instance of the class;
+            path (Path object): path to .npz file.
+        """
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, origin=self.origin, buckets=self.buckets,
+                            events=self.events, signs=self.signs, pointers=self.pointers)
+
+    def covered(self, ts):
+        """
+        Calculates time of each label up to timestamp ts.
+
+        Args:
+            self: the instance of the class;
+            ts (int): timestamp (see datetimes.to_epoch);
+
+        Return:
+            covered (np.array): int64 array, time of each label [us].
+        """
+
+        hours = self.buckets.shape[1]
+
+        if ts <= self.origin:
+            return np.zeros(len(self.buckets), dtype=np.int64)
+        if ts >= self.origin + hours * HOUR:
+            return self.cumulative[:, -1].copy()
+
+        hour = (ts - self.origin) // HOUR
+        hour_start = self.origin + hour * HOUR
+        covered = self.cumulative[:, hour] + self.open[:, hour] * (ts - hour_start)
+
+        # Exact part of the hour from the label changes inside it.
+        for label in range(len(self.buckets)):
+            for event in range(self.pointers[label, hour], self.pointers[label, hour + 1]):
+                if self.events[event] >= ts:
+                    break
+                covered[label] += self.signs[event] * (ts - self.events[event])
+
+        return covered
+
+    def query(self, start_ts, end_ts):
+        """
+        Calculates time of each label within [start_ts, end_ts].
+
+        Args:
+            self: the instance of the class;
+            start_ts (int): start timestamp;
+            end_ts (int): end timestamp;
+
+        Return:
+            days (list): time of each label [days].
+        """
+
+        return ((self.covered(end_ts) - self.covered(start_ts)) / US_PER_DAY).tolist()
+
+def cube_path(issue_name, folder=CUBE_FOLDER):
+    """
+    Returns path of the cube of the tool: history/cube/<issue_name>.npz.
+
+    Args:
+        issue_name (str): tool name as in issue on Gitlab;
+        folder (Path, default=CUBE_FOLDER): cube folder.
+    """
+
+    return Path(folder).resolve() / f'{issue_name}.npz'
+
+def build_cubes(history, issues, labels, folder=CUBE_FOLDER):
+    """
+    Builds and saves cubes of all tools from history
+    (see timetable.timetable_arrays). Cubes are not kept in memory.
+
+    Args:
+        history (dict): label changes history for each issue;
+        issues (dict): dict with project issues: (issue_iid, issue_title);
+        labels (dict): dict with project labels: (label_id, label_name);
+        folder (Path, default=CUBE_FOLDER): cube folder.
+    """
+
+    arrays = timetable_arrays(history, labels)
+
+    for iid, data in arrays.items():
+        if iid in issues:
+            ToolCube.from_arrays(data, len(labels)).save(cube_path(issues[iid], folder))
+
+def load_cubes(issues, folder=CUBE_FOLDER):
+    """
+    Loads saved cubes of the tools.
+
+    Args:
+        issues (dict): dict with project issues: (issue_iid, issue_title);
+        folder (Path, default=CUBE_FOLDER): cube folder;
+
+    Return:
+        cubes (dict): {issue_id: ToolCube}, tools without saved cube are skipped.
+    """
+
+    cubes = {iid: ToolCube.load(cube_path(title, folder)) for iid, title in issues.items()}
+
+    return {iid: cube for iid, cube in cubes.items() if cube is not None}
+
+def cube_summary(cubes,
+                 issues,
+                 labels,
+                 start_dt, end_dt):
+    """
+    Calculates summary time for each issue (tool) for each label (state)
+    within [start_dt, end_dt], the same as timetable.arrays_summary
+    of history clipped by pipeline.clip_intervals.
+
+    Args:
+        cubes (dict): {issue_id: ToolCube}, see load_cubes;
+        issues (dict): dict with project issues: (issue_iid, issue_title);
+        labels (dict): dict with project labels: (label_id, label_name);
+        start_dt (datetime obj): start datetime;
+        end_dt (datetime obj): end datetime;
+
+    Return:
+        summary (dict): dict with the summary time
+                        for each issue (tool) for each label (state).
+    """
+
+    start_ts = to_epoch(start_dt)
+    end_ts = to_epoch(end_dt)
+    summary = {}
+
+    for iid in issues.keys():
+        if iid in cubes:
+            summary[iid] = dict(zip(labels.keys(), cubes[iid].query(start_ts, end_ts)))
+        else:
+            summary[iid] = dict.fromkeys(labels.keys(), 0.)
+
+    return summary
+
+if __name__ == '__main__':
+    pass
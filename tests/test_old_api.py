@@ -0,0 +1,62 @@
+import sys
+import json
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / 'packages'))
+
+from constants import LABELS
+from history_store import load_history
+from old_api import merge_old_history
+
+ISSUE = (1, 'tool')
+
+def note(note_id, body, created_at):
+    """
+    Makes /notes entry of old Gitlab API.
+    """
+
+    return {'id': note_id, 'body': body, 'created_at': created_at,
+            'updated_at': created_at, 'author': {'name': 'user'}}
+
+def test_resync_of_imported_history_adds_no_events(tmp_path, monkeypatch):
+    """
+    Legacy history/<tool>.json keeps the second label of note 7 as '7.5',
+    full re-sync of the same notes must not add it again.
+    """
+
+    monkeypatch.chdir(tmp_path)
+    up, down = list(LABELS.keys())[:2]
+
+    notes = [note(5, f'added ~{up} label', '2018-03-19T11:24:32.866Z'),
+             note(7, f'added ~{down} removed ~{up} labels', '2018-03-20T10:37:13.723Z')]
+
+    entries = {
+        '5': {'date': '2018-03-19T11:24:32.866Z', 'label': LABELS[up],
+              'user': 'user', 'action': 'add'},
+        '7': {'date': '2018-03-20T10:37:13.723Z', 'label': LABELS[down],
+              'user': 'user', 'action': 'add'},
+        '7.5': {'date': '2018-03-20T10:37:13.723Z', 'label': LABELS[up],
+                'user': 'user', 'action': 'remove'}
+    }
+    (tmp_path / 'history').mkdir()
+    (tmp_path / 'history' / 'tool.json').write_text(
+        json.dumps({str(ISSUE[0]): entries, 'ID offset': 7}))
+
+    history = load_history(ISSUE[1], ISSUE[0])
+    merge_old_history(ISSUE, notes, history)
+
+    assert sorted(load_history(ISSUE[1], ISSUE[0])[ISSUE[0]]) == ['5', '7', '7.5']
+
+def test_fresh_download_keeps_note_keys(tmp_path, monkeypatch):
+    """
+    Labels of the note with the max id are within 'ID offset'.
+    """
+
+    monkeypatch.chdir(tmp_path)
+    up, down = list(LABELS.keys())[:2]
+    notes = [note(7, f'added ~{down} removed ~{up} labels', '2018-03-20T10:37:13.723Z')]
+
+    history = merge_old_history(ISSUE, notes)
+
+    assert history['ID offset'] == 7
+    assert sorted(history[ISSUE[0]]) == ['7', '7.5']